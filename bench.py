@@ -0,0 +1,136 @@
+"""
+Benchmarks for the weekly jobs against fake_espn.py: for every league size and current week,
+each job runs from cold season, player and history stores with the response cache off, and the run records wall
+time (best of --repeat), requests, bytes served and peak Python memory (tracemalloc, separate
+run). Results go to .jlbot/bench/<commit>.json; --compare diffs two result files.
+
+    python bench.py --teams 8 12 16 32 --weeks 1 9 18
+    python bench.py --compare .jlbot/bench/<old>.json .jlbot/bench/<new>.json
+"""
+import os, io, sys, json, time, glob, shutil, argparse, platform, subprocess, tracemalloc, contextlib
+
+OUT_DIR = os.path.join(".jlbot", "bench")
+JOB_NAMES = ("awards", "power", "preview")
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def _fresh_store(path, *dirs):
+    for p in glob.glob(path + "*"):
+        os.remove(p)
+    for d in dirs:
+        shutil.rmtree(d, ignore_errors=True)
+
+def bench_job(srv, job: str, teams: int, week: int, repeat: int = 3) -> dict:
+    """Time one job on a `teams`-team league in `week`; every run starts from an empty store."""
+    from espn_http import use_league
+    from history import HISTORY_DIR
+    from player_store import PLAYER_DIR
+    from runner import JOBS
+    from season_store import STORE_PATH
+    settings = {"LEAGUE_ID": "1", "SEASON_ID": "2025", "ESPN_S2": "bench", "SWID": "{bench}",
+                "ESPN_BASE_URL": srv.url, "TIMEZONE": "UTC"}
+    srv.teams, srv.week = teams, week
+    result = {"job": job, "teams": teams, "week": week}
+
+    def once(trace=False):
+        _fresh_store(STORE_PATH, PLAYER_DIR, HISTORY_DIR)
+        srv.reset()
+        with use_league(settings), contextlib.redirect_stdout(io.StringIO()):
+            if trace:
+                tracemalloc.start()
+            t0 = time.perf_counter()
+            try:
+                embed = JOBS[job](None)
+            finally:
+                wall = time.perf_counter() - t0
+                peak = tracemalloc.get_traced_memory()[1] if trace else None
+                if trace:
+                    tracemalloc.stop()
+        return wall, peak, embed
+
+    try:
+        once()  # warm imports and the fake server's payload caches
+        walls = []
+        for _ in range(max(1, repeat)):
+            wall, _, embed = once()
+            walls.append(wall)
+        result.update(wall_s=round(min(walls), 4), requests=srv.requests, bytes=srv.bytes,
+                      fields=len(embed.get("fields") or []))
+        result["peak_mb"] = round(once(trace=True)[1] / 2**20, 2)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+def run(teams, weeks, jobs, repeat=3, periods=14) -> dict:
+    """Benchmark every (job, teams, week) combination against one in-process fake ESPN server."""
+    from fake_espn import FakeESPN
+    srv = FakeESPN(periods=periods).start()
+    try:
+        results = []
+        for n in teams:
+            for w in weeks:
+                for job in jobs:
+                    r = bench_job(srv, job, n, w, repeat)
+                    results.append(r)
+                    if "error" in r:
+                        print(f"{job:8s} teams={n:<3d} week={w:<3d} ERROR {r['error']}")
+                    else:
+                        print(f"{job:8s} teams={n:<3d} week={w:<3d} {r['wall_s'] * 1000:8.1f} ms "
+                              f"{r['requests']:3d} req {r['bytes'] / 1024:9.1f} KiB {r['peak_mb']:7.2f} MB peak")
+    finally:
+        srv.shutdown()
+    return {"commit": _commit(), "python": platform.python_version(), "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "repeat": repeat,
+            "periods": periods, "results": results}
+
+def compare(old: dict, new: dict):
+    """Print new/old ratios for wall time, requests, bytes and peak memory per matching run."""
+    key = lambda r: (r["job"], r["teams"], r["week"])
+    before = {key(r): r for r in old["results"] if "error" not in r}
+    print(f"{old['commit']} -> {new['commit']}")
+    for r in new["results"]:
+        o = before.get(key(r))
+        if o is None or "error" in r:
+            continue
+        ratio = lambda k: r[k] / o[k] if o[k] else float("nan")
+        flag = "  <-- slower" if ratio("wall_s") > 1.2 else ""
+        print(f"{r['job']:8s} teams={r['teams']:<3d} week={r['week']:<3d} wall x{ratio('wall_s'):.2f} "
+              f"req x{ratio('requests'):.2f} bytes x{ratio('bytes'):.2f} peak x{ratio('peak_mb'):.2f}{flag}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the weekly jobs against synthetic leagues")
+    ap.add_argument("--teams", nargs="+", type=int, default=[8, 12, 16, 32])
+    ap.add_argument("--weeks", nargs="+", type=int, default=[1, 9, 18], help="current (in-progress) matchup periods")
+    ap.add_argument("--jobs", nargs="+", choices=JOB_NAMES, default=list(JOB_NAMES))
+    ap.add_argument("--periods", type=int, default=14, help="regular-season matchup periods")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per case; the fastest is reported")
+    ap.add_argument("--out", help=f"result file (default: {OUT_DIR}/<commit>.json)")
+    ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="diff two result files and exit")
+    args = ap.parse_args(argv)
+    if args.compare:
+        with open(args.compare[0]) as a, open(args.compare[1]) as b:
+            compare(json.load(a), json.load(b))
+        return 0
+
+    # Cold runs only: no response cache, throwaway season, player and history stores
+    os.environ["ESPN_CACHE_DIR"] = ""
+    os.environ["JLBOT_TELEMETRY"] = ""
+    os.environ["JLBOT_STORE"] = os.path.join(OUT_DIR, "bench.sqlite")
+    os.environ["JLBOT_PLAYER_DIR"] = os.path.join(OUT_DIR, "players")
+    os.environ["JLBOT_HISTORY_DIR"] = os.path.join(OUT_DIR, "history")
+    os.makedirs(OUT_DIR, exist_ok=True)
+    report = run(args.teams, args.weeks, args.jobs, args.repeat, args.periods)
+    _fresh_store(os.environ["JLBOT_STORE"], os.environ["JLBOT_PLAYER_DIR"], os.environ["JLBOT_HISTORY_DIR"])
+    out = args.out or os.path.join(OUT_DIR, f"{report['commit']}.json")
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print("Results written to", out)
+    return 1 if any("error" in r for r in report["results"]) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,23 @@
-import os, json
-from espn_http import get
+from espn_http import SCHEDULE, get, get_stream, league_query
+from models import Matchup
 
 def main():
     week = get("mSettings")["status"]["currentMatchupPeriod"]
-    mm = get("mMatchup")
-    schedule = [s for s in mm.get("schedule", []) if s.get("matchupPeriodId") == week]
+    # Stream the schedule and stop at the first matchup of the week
+    first = next(get_stream("mMatchup", SCHEDULE, where=lambda m: m.get("matchupPeriodId") == week,
+                            **league_query(matchup_periods=[week], scoring_period=week)), None)
     print("Debugging projections for week", week)
 
     # Print just one team’s roster JSON for inspection
-    if schedule:
-        side = schedule[0]["home"]  # first team we find
-        entries = ((side.get("rosterForCurrentScoringPeriod") or {}).get("entries")) or []
-        for e in entries:
-            slot = e.get("lineupSlotId")
-            name = (e.get("playerPoolEntry") or {}).get("player", {}).get("fullName")
-            stats = (e.get("playerPoolEntry") or {}).get("player", {}).get("stats", [])
-            print("\n", name, "slot", slot)
-            for s in stats:
-                if s.get("scoringPeriodId") == week:
-                    print("  statSourceId:", s.get("statSourceId"),
-                          "split:", s.get("statSplitTypeId"),
-                          "appliedTotal:", s.get("appliedTotal"))
+    if first:
+        side = Matchup(first).home  # first team we find
+        for e in side.entries:
+            print("\n", e.name, "slot", e.slot)
+            for s in e.stats:
+                if s.period == week:
+                    print("  statSourceId:", s.source,
+                          "split:", s.split,
+                          "appliedTotal:", s.applied)
 
 if __name__ == "__main__":
     main()
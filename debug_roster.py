@@ -1,24 +1,19 @@
-import os
 from espn_http import get
+from models import parse_teams
 
-def main():
-    week = 1  # hardcode Week 1 for inspection
+def main(week=1):
     roster = get("mRoster", params={"scoringPeriodId": week})
-    print("Teams:", len(roster.get("teams", [])))
-    for team in roster.get("teams", []):
-        tname = (team.get("location","") + " " + team.get("nickname","")).strip()
-        print("\n===", tname, "===")
-        entries = ((team.get("roster") or {}).get("entries")) or []
-        for e in entries[:3]:  # only show 3 players per team for brevity
-            p = (e.get("playerPoolEntry") or {}).get("player", {}) or {}
-            name = p.get("fullName")
-            stats = p.get("stats", [])
-            print(" ", name)
-            for s in stats:
-                if s.get("scoringPeriodId") == week:
-                    print("   statSourceId:", s.get("statSourceId"),
-                          "split:", s.get("statSplitTypeId"),
-                          "appliedTotal:", s.get("appliedTotal"))
+    teams = parse_teams(roster)
+    print("Teams:", len(teams))
+    for team in teams.values():
+        print("\n===", team.name, "===")
+        for e in team.entries[:3]:  # only show 3 players per team for brevity
+            print(" ", e.name)
+            for s in e.stats:
+                if s.period == week:
+                    print("   statSourceId:", s.source,
+                          "split:", s.split,
+                          "appliedTotal:", s.applied)
 
 if __name__ == "__main__":
     main()
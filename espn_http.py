@@ -1,12 +1,82 @@
-import os, requests
+import os, json, time, random, hashlib, threading, contextvars, contextlib, ijson, requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from telemetry import span
+
+TIMEOUT = 20
+MAX_RETRIES = int(os.environ.get("ESPN_MAX_RETRIES", "3"))
+BACKOFF = 0.5          # seconds; doubled per attempt, then jittered
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# On-disk response cache (restored between Actions runs via actions/cache).
+# Responses pinned to an already-completed scoring/matchup period never change,
+# so they are kept forever; everything else expires after CACHE_TTL seconds.
+CACHE_DIR = os.environ.get("ESPN_CACHE_DIR", os.path.join(".jlbot", "cache"))
+CACHE_TTL = int(os.environ.get("ESPN_CACHE_TTL", "300"))
+OFFLINE = os.environ.get("ESPN_OFFLINE") == "1"  # serve only from the cache, never touch the network
+
+# Per-host probe results written by debug_league.py (see probe()); used to order bases.
+HEALTH_FILE = os.environ.get("ESPN_HEALTH_FILE", os.path.join(".jlbot", "health.json"))
+HEALTH_MAX_AGE = 7 * 24 * 3600  # a weekly bot: last week's probe is still informative
+PROBE_TIMEOUT = 5
+HISTORY_BEFORE = 2018  # first season served by the regular seasons/{year} league endpoint
+
+_league = contextvars.ContextVar("league", default=None)  # per-league settings when several run in one process
+_session = None
+_session_lock = threading.Lock()
+_sticky = {}  # (lid, year) -> base that last returned JSON
+
+class _NoStore(DefaultCookiePolicy):
+    # Credentials are passed per request; never let a Set-Cookie from one
+    # response get replayed on later requests (possibly for another league).
+    def set_ok(self, cookie, request):
+        return False
+
+def env(name: str, default=None):
+    """A league setting (LEAGUE_ID, SEASON_ID, ESPN_S2, SWID, WEBHOOK_URL, TIMEZONE, ...) for the active league."""
+    settings = _league.get()
+    if settings is not None:
+        v = settings.get(name)
+        return default if v in (None, "") else v
+    v = os.environ.get(name)
+    return default if v in (None, "") else v
+
+@contextlib.contextmanager
+def use_league(settings: dict):
+    """Scope env() (and so every fetch, cache key and store) to one league's settings in this thread."""
+    token = _league.set(settings)
+    try:
+        yield settings
+    finally:
+        _league.reset(token)
+
+def active_settings() -> dict:
+    """A copy of the active league's settings, e.g. to re-scope a worker thread or swap SEASON_ID."""
+    settings = _league.get()
+    return dict(settings if settings is not None else os.environ)
+
+def _require(name):
+    v = env(name)
+    if v is None:
+        raise KeyError(name)
+    return v
 
 def _ctx():
-    lid  = os.environ["LEAGUE_ID"]
-    year = os.environ["SEASON_ID"]
+    lid  = _require("LEAGUE_ID")
+    year = _require("SEASON_ID")
+    # ESPN_BASE_URL points every request at one host instead (e.g. fake_espn.py for benchmarks)
+    override = env("ESPN_BASE_URL")
+    roots = [override.rstrip("/")] if override else ["https://lm-api-reads.fantasy.espn.com", "https://fantasy.espn.com"]
+    # Seasons before 2018 are only served by the leagueHistory endpoint (as a one-element list)
+    history = int(year) < HISTORY_BEFORE
+    path = f"leagueHistory/{lid}" if history else f"seasons/{year}/segments/0/leagues/{lid}"
     return {
         "lid": lid,
         "year": year,
-        "cookies": {"espn_s2": os.environ["ESPN_S2"], "SWID": os.environ["SWID"]},
+        "history": history,
+        "cookies": {"espn_s2": _require("ESPN_S2"), "SWID": _require("SWID")},
         "headers": {
             "User-Agent": "Mozilla/5.0",
             "Accept": "application/json",
@@ -14,19 +84,388 @@ def _ctx():
             "X-Fantasy-Platform": "kona",
             "X-Fantasy-Source": "kona",
         },
-        "bases": [
-            f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/{year}/segments/0/leagues/{lid}",
-            f"https://fantasy.espn.com/apis/v3/games/ffl/seasons/{year}/segments/0/leagues/{lid}",
-        ],
+        "bases": [f"{root}/apis/v3/games/ffl/{path}" for root in roots],
     }
 
-def get(view: str, params: dict | None = None):
+def session() -> requests.Session:
+    """Process-wide keep-alive session, so every view reuses the same TCP+TLS connections."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.cookies.set_policy(_NoStore())
+                _session = s
+    return _session
+
+def read_health() -> dict:
+    """{host: {"ok", "status", "content_type", "redirects", "latency_ms", "checked_at"}} from the last probe."""
+    try:
+        with open(HEALTH_FILE) as f:
+            health = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    cutoff = time.time() - HEALTH_MAX_AGE
+    return {h: e for h, e in health.items() if e.get("checked_at", 0) >= cutoff}
+
+def _ordered_bases(c):
+    """Sticky base first, then healthy bases fastest-first; known-bad bases only when nothing else is left."""
+    health = read_health()
+    def rank(base):
+        e = health.get(urlparse(base).netloc)
+        if e is None:
+            return (1, 0.0)
+        return (0 if e.get("ok") else 2, e.get("latency_ms") or 0.0)
+    bases = sorted(c["bases"], key=rank)
+    good = [b for b in bases if rank(b)[0] < 2]
+    bases = good or bases
+    pinned = _sticky.get((c["lid"], c["year"]))
+    if pinned in bases:
+        return [pinned] + [b for b in bases if b != pinned]
+    return bases
+
+def retry_delay(attempt, r=None):
+    """Seconds to wait before retrying: the response's Retry-After, else jittered exponential backoff."""
+    if r is not None:
+        ra = r.headers.get("Retry-After")
+        try:
+            return min(float(ra), 60.0)
+        except (TypeError, ValueError):
+            pass
+    return BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+def _request(base, c, q, headers=None, stream=False, info=None):
+    """
+    GET one base with bounded retries on 429/5xx and connection errors. Returns the last response or None.
+    `info` (a span's attributes) collects the retry count.
+    """
+    r = None
+    headers = {**c["headers"], **headers} if headers else c["headers"]
+    for attempt in range(MAX_RETRIES + 1):
+        if info is not None:
+            info["retries"] = info.get("retries", 0) + (attempt > 0)
+        try:
+            r = session().get(base, headers=headers, cookies=c["cookies"], params=q, timeout=TIMEOUT, stream=stream)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == MAX_RETRIES:
+                print(f"[espn] {base} failed after {attempt + 1} attempts: {e}")
+                return None
+            time.sleep(retry_delay(attempt))
+            continue
+        if r.status_code in RETRY_STATUS and attempt < MAX_RETRIES:
+            r.close()
+            time.sleep(retry_delay(attempt, r))
+            continue
+        return r
+    return r
+
+def _is_json(r):
+    return r is not None and r.status_code == 200 and "application/json" in r.headers.get("content-type","").lower()
+
+def _cache_key(views, params, filters=None):
+    ident = {
+        "lid": _require("LEAGUE_ID"),
+        "year": _require("SEASON_ID"),
+        "views": sorted(views),
+        "params": {k: str(v) for k, v in (params or {}).items()},
+    }
+    if filters:
+        ident["filters"] = filters
+    return hashlib.sha256(json.dumps(ident, sort_keys=True).encode()).hexdigest()
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+def _is_final(doc, params):
+    """True when the request is pinned to a period the league has already moved past."""
+    status = doc.get("status") or {}
+    current = {
+        "scoringPeriodId": status.get("latestScoringPeriod") or doc.get("scoringPeriodId"),
+        "matchupPeriodId": status.get("currentMatchupPeriod"),
+    }
+    for k, cur in current.items():
+        v = (params or {}).get(k)
+        if v is not None and cur is not None and int(v) < int(cur):
+            return True
+    return False
+
+def _cache_read(key):
+    if not CACHE_DIR:
+        return None
+    try:
+        with open(_cache_path(key)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    meta = entry.get("meta") or {}
+    if OFFLINE or meta.get("final") or time.time() - meta.get("fetched_at", 0) < CACHE_TTL:
+        return entry.get("doc")
+    return None
+
+def _cache_write(key, views, params, doc):
+    if not CACHE_DIR:
+        return
+    path = _cache_path(key)
+    meta = {"views": views, "params": params, "final": _is_final(doc, params), "fetched_at": time.time()}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"meta": meta, "doc": doc}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[espn] cache write failed: {e}")
+
+def _cache_finish(key, views, params, tmp):
+    """
+    Complete a streamed cache entry: `tmp` holds '{"doc":' plus the raw body as it arrived. The
+    meta goes after it (key order is irrelevant to JSON), then the file moves into place.
+    """
+    try:
+        with open(tmp, "rb") as f:
+            status = next(ijson.items(f, "doc.status"), None) or {}
+        with open(tmp, "rb") as f:
+            period = next(ijson.items(f, "doc.scoringPeriodId"), None)
+        meta = {"views": views, "params": params, "final": _is_final({"status": status, "scoringPeriodId": period}, params),
+                "fetched_at": time.time()}
+        with open(tmp, "ab") as f:
+            f.write(b',"meta":' + json.dumps(meta, separators=(",", ":")).encode() + b"}")
+        os.replace(tmp, _cache_path(key))
+    except (OSError, ValueError, ijson.JSONError) as e:
+        print(f"[espn] cache write failed: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+
+class _Tee:
+    """File-like response body for ijson that copies every chunk it reads into `sink`."""
+    def __init__(self, raw, sink):
+        self.raw, self.sink = raw, sink
+
+    def read(self, n=-1):
+        b = self.raw.read(n)
+        self.sink.write(b)
+        return b
+
+def league_query(matchup_periods=None, scoring_period: int | None = None, team_ids=None) -> dict:
+    """
+    Build get_views() kwargs that narrow a league request server-side:
+    `matchup_periods` / `team_ids` become an X-Fantasy-Filter on the schedule, and
+    `scoring_period` pins scoringPeriodId so rosters only carry that period's stat lines.
+    A single matchup period (or team) is also sent as matchupPeriodId (or rosterForTeamId).
+    """
+    params, schedule = {}, {}
+    if scoring_period is not None:
+        params["scoringPeriodId"] = int(scoring_period)
+    if matchup_periods is not None:
+        periods = sorted({int(p) for p in matchup_periods})
+        schedule["filterMatchupPeriodIds"] = {"value": periods}
+        if len(periods) == 1:
+            params["matchupPeriodId"] = periods[0]
+    if team_ids is not None:
+        teams = sorted({int(t) for t in team_ids})
+        schedule["filterTeamIds"] = {"value": teams}
+        if len(teams) == 1:
+            params["rosterForTeamId"] = teams[0]
+    return {"params": params or None, "filters": {"schedule": schedule} if schedule else None}
+
+def get_views(views, params: dict | None = None, filters: dict | None = None):
+    """
+    Fetch several views (e.g. ["mSettings", "mMatchup", "mTeam"]) in a single request.
+    ESPN merges them into one league document, so the result holds every view's keys.
+    `filters` is sent as the X-Fantasy-Filter header (see league_query()).
+    Served from the on-disk cache when fresh (or always, with ESPN_OFFLINE=1).
+    """
+    views = list(views)
+    key = _cache_key(views, params, filters)
+    with span("fetch", views=",".join(views), params=params or {}, filtered=bool(filters)) as info:
+        doc = _cache_read(key)
+        info["cache"] = "hit" if doc is not None else "miss"
+        if doc is not None:
+            return doc
+        if OFFLINE:
+            raise RuntimeError(f"ESPN_OFFLINE=1 and no cached response (views={views}, params={params})")
+        r = _live(views, params, filters, info=info)
+        info["bytes"] = len(r.content)
+        print(f"[espn] views={','.join(views)} params={params or {}} filtered={'yes' if filters else 'no'} "
+              f"bytes={info['bytes']}")
+        with span("parse", what="json", views=info["views"]):
+            doc = r.json()
+        if isinstance(doc, list):  # leagueHistory
+            doc = doc[0] if doc else {}
+    _cache_write(key, views, params, doc)
+    return doc
+
+def get_raw(views, params: dict | None = None, filters: dict | None = None) -> bytes:
+    """Uncached fetch returning the response body as-is, for callers that compare polls (live.py)."""
+    views = list(views)
+    with span("fetch", views=",".join(views), params=params or {}, filtered=bool(filters), cache="bypass") as info:
+        if OFFLINE:
+            raise RuntimeError(f"ESPN_OFFLINE=1 and live data was requested (views={views}, params={params})")
+        r = _live(views, params, filters, info=info)
+        info["bytes"] = len(r.content)
+        return r.content
+
+def get_pro_schedule() -> dict:
+    """
+    The season's NFL schedule (season-level proTeamSchedules_wl view, not league-scoped):
+    settings.proTeams[].proGamesByScoringPeriod with each game's kickoff date and statsOfficial.
+    """
     c = _ctx()
-    q = {"view": view}
+    season = f"/apis/v3/games/ffl/seasons/{c['year']}"
+    with span("fetch", views="proTeamSchedules_wl", params={}, filtered=False, cache="bypass") as info:
+        for base in _ordered_bases(c):
+            url = base.split("/apis/")[0] + season
+            r = _request(url, c, {"view": "proTeamSchedules_wl"}, info=info)
+            info["base"], info["status"] = urlparse(url).netloc, getattr(r, "status_code", None)
+            if _is_json(r):
+                info["bytes"] = len(r.content)
+                return r.json()
+            if r is not None:
+                r.close()
+    raise RuntimeError("ESPN returned non-JSON or non-200 for the pro schedule on every base")
+
+def _live(views, params, filters, stream=False, info=None):
+    """
+    First JSON 200 across the bases (sticky base first); raises if every base fails. Fills `info`
+    with the host only (base URLs carry the league id) and the status.
+    """
+    c = _ctx()
+    q = {"view": views}
+    if c["history"]:
+        q["seasonId"] = c["year"]
     if params:
         q.update(params)
-    for base in c["bases"]:
-        r = requests.get(base, headers=c["headers"], cookies=c["cookies"], params=q, timeout=20)
-        if r.status_code == 200 and "application/json" in r.headers.get("content-type","").lower():
-            return r.json()
-    raise RuntimeError(f"ESPN returned non-JSON or non-200 for all endpoints (view={view}, params={params})")
+    headers = {"X-Fantasy-Filter": json.dumps(filters, separators=(",", ":"))} if filters else None
+    for base in _ordered_bases(c):
+        r = _request(base, c, q, headers, stream, info)
+        if info is not None:
+            info["base"], info["status"] = urlparse(base).netloc, getattr(r, "status_code", None)
+        if _is_json(r):
+            _sticky[(c["lid"], c["year"])] = base
+            return r
+        if r is not None:
+            r.close()
+    raise RuntimeError(f"ESPN returned non-JSON or non-200 for all endpoints (views={views}, params={params})")
+
+SCHEDULE = "schedule.item"
+TEAMS = "teams.item"
+ROSTER_ENTRIES = "teams.item.roster.entries.item"
+
+def _walk(doc, path):
+    """Yield what ijson.items(path) would from an already-parsed document."""
+    nodes = [doc]
+    for part in path.split("."):
+        nxt = []
+        for n in nodes:
+            if part == "item":
+                nxt.extend(n if isinstance(n, list) else ())
+            elif isinstance(n, dict) and part in n:
+                nxt.append(n[part])
+        nodes = nxt
+    return iter(nodes)
+
+def get_stream(views, path: str = SCHEDULE, params: dict | None = None, filters: dict | None = None, where=None):
+    """
+    Parse a league response incrementally from the socket and yield only the objects at `path`
+    (SCHEDULE, TEAMS or ROSTER_ENTRIES), optionally only those passing `where(item)`.
+    Peak memory is one item rather than the whole document. The raw body is copied to a temp
+    file as it is parsed and, once fully read, becomes a regular cache entry, so a fresh cached
+    copy (or ESPN_OFFLINE=1) is served from disk next time.
+    """
+    views = [views] if isinstance(views, str) else list(views)
+    key = _cache_key(views, params, filters)
+    # The span covers the whole iteration, so its latency includes the caller's per-item work
+    with span("fetch", views=",".join(views), params=params or {}, filtered=bool(filters), stream=True) as info:
+        doc = _cache_read(key)
+        info["cache"] = "hit" if doc is not None else "miss"
+        if doc is not None:
+            yield from (item for item in _walk(doc, path) if where is None or where(item))
+            return
+        if OFFLINE:
+            raise RuntimeError(f"ESPN_OFFLINE=1 and no cached response (views={views}, params={params})")
+        r = _live(views, params, filters, stream=True, info=info)
+        tmp = sink = None
+        complete = False
+        try:
+            r.raw.decode_content = True
+            body = r.raw
+            if CACHE_DIR:
+                tmp = f"{_cache_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    os.makedirs(os.path.dirname(tmp), exist_ok=True)
+                    sink = open(tmp, "wb")
+                    sink.write(b'{"doc":')
+                    body = _Tee(r.raw, sink)
+                except OSError as e:
+                    print(f"[espn] cache write failed: {e}")
+            for item in ijson.items(body, path, use_float=True):
+                if where is None or where(item):
+                    yield item
+            while body.read(65536):  # anything after the document's last token
+                pass
+            complete = True
+        finally:
+            info["bytes"] = r.raw.tell()
+            r.close()
+            print(f"[espn] views={','.join(views)} params={params or {}} filtered={'yes' if filters else 'no'} "
+                  f"bytes={info['bytes']} stream=yes")
+            if sink is not None:
+                sink.close()
+                if complete:
+                    _cache_finish(key, views, params, tmp)
+                else:  # the caller stopped early; a partial body is no cache entry
+                    with contextlib.suppress(OSError):
+                        os.remove(tmp)
+
+def _probe_one(base, view, c, timeout):
+    t0 = time.perf_counter()
+    out = {"base": base, "host": urlparse(base).netloc, "view": view}
+    try:
+        r = session().get(base, headers=c["headers"], cookies=c["cookies"], params={"view": view},
+                          timeout=timeout, allow_redirects=True)
+    except requests.RequestException as e:
+        return {**out, "ok": False, "status": None, "content_type": "", "redirects": [], "final_url": None,
+                "latency_ms": round((time.perf_counter() - t0) * 1000, 1), "error": str(e), "peek": ""}
+    return {**out, "ok": _is_json(r), "status": r.status_code, "content_type": r.headers.get("content-type", ""),
+            "redirects": [h.status_code for h in r.history], "final_url": r.url,
+            "latency_ms": round((time.perf_counter() - t0) * 1000, 1), "error": None,
+            "peek": r.text[:200].replace("\n", " ")}
+
+def probe(views=("mTeam", "mMatchup", "mSettings"), timeout: float = PROBE_TIMEOUT, save: bool = True) -> list:
+    """
+    Hit every base x view concurrently with a short timeout. Returns one result per pair and,
+    with `save`, records per-host health (any JSON 200 = ok, median JSON latency) in HEALTH_FILE.
+    Health is shared by every league, so a host is only marked bad for failures that aren't
+    about this league's credentials or id: connection errors, timeouts and 5xx. A 401/403/404 or
+    a non-JSON login page leaves the host's entry as it was.
+    """
+    c = _ctx()
+    pairs = [(b, v) for b in c["bases"] for v in views]
+    with ThreadPoolExecutor(max_workers=len(pairs)) as pool:
+        results = list(pool.map(lambda bv: _probe_one(bv[0], bv[1], c, timeout), pairs))
+    if save:
+        health = read_health()
+        now = time.time()
+        for host in {r["host"] for r in results}:
+            rs = [r for r in results if r["host"] == host]
+            ok = sorted(r["latency_ms"] for r in rs if r["ok"])
+            if not ok and not all(r["status"] is None or r["status"] >= 500 for r in rs):
+                continue
+            last = max(rs, key=lambda r: r["ok"])
+            health[host] = {"ok": bool(ok), "status": last["status"], "content_type": last["content_type"],
+                            "redirects": last["redirects"],
+                            "latency_ms": ok[len(ok) // 2] if ok else max(r["latency_ms"] for r in rs),
+                            "checked_at": now}
+        try:
+            os.makedirs(os.path.dirname(HEALTH_FILE) or ".", exist_ok=True)
+            with open(HEALTH_FILE, "w") as f:
+                json.dump(health, f, indent=2)
+        except OSError as e:
+            print(f"[espn] health write failed: {e}")
+    return results
+
+def get(view: str, params: dict | None = None):
+    return get_views([view], params)
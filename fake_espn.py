@@ -0,0 +1,259 @@
+"""
+Local stand-in for the ESPN fantasy API. Serves deterministic synthetic leagues (any team
+count, any current week) for the views the bot asks for — mSettings, mTeam, mMatchup /
+mMatchupScore with rosters attached, mRoster, mTransactions2 — and honors scoringPeriodId,
+rosterForTeamId and the X-Fantasy-Filter header. Counts requests and bytes served.
+
+    python fake_espn.py --teams 12 --week 9 --port 8766
+    ESPN_BASE_URL=http://127.0.0.1:8766 LEAGUE_ID=1 SEASON_ID=2025 ESPN_S2=x SWID=x python weekly_power.py
+"""
+import json, time, zlib, random, argparse, threading
+from functools import lru_cache
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from models import BENCH, IR, ACTUAL, PROJECTION, TOTAL
+
+SLOT_COUNTS = {0: 1, 2: 2, 4: 2, 6: 1, 23: 1, 16: 1, 17: 1, BENCH: 6, IR: 1}
+FLEX = 23
+# (defaultPositionId, eligible lineup slots, mean points) for each roster spot, starters first
+ROSTER = [(0, [0], 18), (2, [2, FLEX], 13), (2, [2, FLEX], 11), (4, [4, FLEX], 13), (4, [4, FLEX], 11),
+          (6, [6, FLEX], 8), (2, [2, FLEX], 9), (16, [16], 8), (17, [17], 8),
+          (0, [0], 15), (2, [2, FLEX], 9), (2, [2, FLEX], 7), (4, [4, FLEX], 10), (4, [4, FLEX], 8),
+          (6, [6, FLEX], 6), (4, [4, FLEX], 5)]
+ACQUISITIONS = ("DRAFT", "DRAFT", "DRAFT", "ADD", "TRADE")
+TXN_TYPES = ("FREEAGENT", "FREEAGENT", "WAIVER", "WAIVER", "TRADE_ACCEPT")
+SEASON_START_MS = 1_757_000_000_000  # processDate of period 1's first move
+WEEK_MS = 7 * 24 * 3600 * 1000
+PRO_TEAMS = 32
+# Kickoff offsets (ms after the first game) by game index: the early slate, the late slate, SNF, MNF
+KICKOFFS = [0] * 10 + [205 * 60_000] * 4 + [440 * 60_000, 1_875 * 60_000]
+
+def _rng(*key) -> random.Random:
+    # crc32, not hash(): str hashing changes with PYTHONHASHSEED, and the data must not
+    return random.Random(zlib.crc32(repr(key).encode()))
+
+def pairings(teams: int, week: int) -> list:
+    """Round-robin (circle method) pairs for a week; an odd league gives one team a bye (None)."""
+    ids = list(range(1, teams + 1)) + ([None] if teams % 2 else [])
+    k = (week - 1) % (len(ids) - 1)
+    rot = [ids[0]] + ids[1:][-k:] + ids[1:][:-k] if k else ids
+    half = len(rot) // 2
+    return [(rot[i], rot[-1 - i]) if rot[i] is not None else (rot[-1 - i], None) for i in range(half)]
+
+@lru_cache(maxsize=4096)
+def entries(team: int, week: int, seed: int = 0) -> list:
+    """One team's roster for a week: starters in slot order, then bench and IR, each with actual + projected stats. Shared; don't mutate."""
+    slots = [s for s, n in SLOT_COUNTS.items() if s not in (BENCH, IR) for _ in range(n)]
+    out = []
+    for i, (pos, elig, mean) in enumerate(ROSTER):
+        pid = team * 1000 + i
+        r = _rng(seed, pid, week)
+        proj = round(max(0.0, r.gauss(mean, 2.0)), 2)
+        pts = round(max(0.0, r.gauss(proj, mean * 0.5)), 2)
+        slot = slots[i] if i < len(slots) else IR if i == len(ROSTER) - 1 else BENCH
+        stats = [{"scoringPeriodId": week, "statSourceId": PROJECTION, "statSplitTypeId": TOTAL, "appliedTotal": proj},
+                 {"scoringPeriodId": week, "statSourceId": ACTUAL, "statSplitTypeId": TOTAL, "appliedTotal": pts}]
+        out.append({"playerId": pid, "lineupSlotId": slot, "acquisitionType": _rng(seed, pid).choice(ACQUISITIONS),
+                    "playerPoolEntry": {"id": pid, "appliedStatTotal": pts, "player": {
+                        "id": pid, "fullName": f"Player {team}-{i}", "defaultPositionId": pos, "proTeamId": pid % PRO_TEAMS + 1,
+                        "eligibleSlots": elig + [BENCH, IR], "stats": stats}}})
+    return out
+
+@lru_cache(maxsize=1024)
+def transactions(teams: int, period: int, seed: int = 0) -> list:
+    """A period's moves across the league, oldest first: adds/drops, waiver bids, trades, some cancelled. Shared; don't mutate."""
+    r = _rng(seed, "txn", period)
+    out = []
+    for i in range(r.randint(teams // 2, teams * 2)):
+        kind, team = r.choice(TXN_TYPES), r.randint(1, teams)
+        t = {"id": f"{seed:x}-{period}-{i}", "type": kind, "status": "CANCELED" if r.random() < 0.1 else "EXECUTED",
+             "teamId": team, "scoringPeriodId": period, "bidAmount": r.randint(0, 30) if kind == "WAIVER" else 0,
+             "processDate": SEASON_START_MS + (period - 1) * WEEK_MS + i * 600_000 + r.randint(0, 599_999)}
+        if kind == "TRADE_ACCEPT":
+            other = r.choice([o for o in range(1, teams + 1) if o != team] or [team])
+            t["items"] = [{"type": "TRADE", "playerId": team * 1000 + r.randrange(len(ROSTER)), "fromTeamId": team, "toTeamId": other},
+                          {"type": "TRADE", "playerId": other * 1000 + r.randrange(len(ROSTER)), "fromTeamId": other, "toTeamId": team}]
+        else:
+            t["items"] = [{"type": "ADD", "playerId": 900_000 + r.randrange(100_000), "fromTeamId": 0, "toTeamId": team},
+                          {"type": "DROP", "playerId": team * 1000 + r.randrange(len(ROSTER)), "fromTeamId": team, "toTeamId": 0}]
+        out.append(t)
+    return out
+
+def pro_schedule(week: int, periods: int, kickoff_ms: int) -> dict:
+    """
+    proTeamSchedules_wl: every period's NFL games. Earlier periods are official; the current one
+    kicks off at `kickoff_ms` (later ones a week apart), so live runs see games start and end.
+    """
+    teams = {t: {"id": t, "abbrev": f"P{t}", "proGamesByScoringPeriod": {}} for t in range(1, PRO_TEAMS + 1)}
+    for p in range(1, max(periods, week) + 1):
+        start = SEASON_START_MS + (p - 1) * WEEK_MS if p < week else kickoff_ms + (p - week) * WEEK_MS
+        for g, (h, a) in enumerate(pairings(PRO_TEAMS, p)):
+            game = {"id": p * 100 + g, "date": start + KICKOFFS[g], "homeProTeamId": h, "awayProTeamId": a,
+                    "statsOfficial": p < week}
+            for t in (h, a):
+                teams[t]["proGamesByScoringPeriod"][str(p)] = [game]
+    return {"settings": {"proTeams": list(teams.values())}}
+
+def _score(team: int, week: int, seed: int) -> float:
+    return round(sum(e["playerPoolEntry"]["appliedStatTotal"] for e in entries(team, week, seed)
+                     if e["lineupSlotId"] not in (BENCH, IR)), 2)
+
+@lru_cache(maxsize=64)
+def league(teams: int = 12, week: int = 9, periods: int = 14, seed: int = 0, league_id: int = 1, season: int = 2025) -> dict:
+    """
+    Synthetic league as of `week` (in progress): settings, teams with records and the schedule
+    (without rosters) through the regular season, or through `week` when that is later.
+    """
+    schedule, records = [], {t: {"wins": 0, "losses": 0, "ties": 0, "pointsFor": 0.0} for t in range(1, teams + 1)}
+    mid = 0
+    for w in range(1, max(periods, week) + 1):
+        for h, a in pairings(teams, w):
+            mid += 1
+            done = w < week
+            home = {"teamId": h, "totalPoints": _score(h, w, seed) if done else 0.0, "totalProjectedPoints": 0.0}
+            away = {"teamId": a, "totalPoints": _score(a, w, seed) if done else 0.0, "totalProjectedPoints": 0.0} if a else None
+            winner = "UNDECIDED"
+            if done:
+                records[h]["pointsFor"] += home["totalPoints"]
+                if away:
+                    records[a]["pointsFor"] += away["totalPoints"]
+                    d = home["totalPoints"] - away["totalPoints"]
+                    winner = "HOME" if d > 0 else "AWAY" if d < 0 else "TIE"
+                    for t, res in ((h, d), (a, -d)):
+                        records[t]["wins" if res > 0 else "losses" if res < 0 else "ties"] += 1
+            m = {"id": mid, "matchupPeriodId": w, "home": home, "winner": winner}
+            if away:
+                m["away"] = away
+            schedule.append(m)
+    final = sorted(records, key=lambda t: (-records[t]["wins"], -records[t]["pointsFor"]))
+    return {
+        "id": league_id, "seasonId": season, "scoringPeriodId": week,
+        "status": {"currentMatchupPeriod": week, "latestScoringPeriod": week, "isActive": week <= periods,
+                   "previousSeasons": list(range(season - 10, season))},
+        "settings": {"name": f"Synthetic League {teams}", "size": teams,
+                     "rosterSettings": {"lineupSlotCounts": {str(k): v for k, v in SLOT_COUNTS.items()}},
+                     "scheduleSettings": {"matchupPeriodCount": periods, "playoffTeamCount": min(6, teams)}},
+        "teams": [{"id": t, "location": "Team", "nickname": f"{t:02d}", "abbrev": f"T{t}", "primaryOwner": f"owner-{t}",
+                   "record": {"overall": {**records[t], "pointsFor": round(records[t]["pointsFor"], 2)}},
+                   "rankCalculatedFinal": final.index(t) + 1 if week > periods else 0}
+                  for t in range(1, teams + 1)],
+        "schedule": schedule,
+    }
+
+def payload(doc: dict, views, params: dict, filters: dict | None, seed: int = 0) -> dict:
+    """What ESPN would return for `views` with the given query params and X-Fantasy-Filter."""
+    out = {k: doc[k] for k in ("id", "seasonId", "scoringPeriodId", "status")}
+    period = int(params.get("scoringPeriodId") or doc["scoringPeriodId"])
+    sched = (filters or {}).get("schedule") or {}
+    periods = set((sched.get("filterMatchupPeriodIds") or {}).get("value") or ())
+    team_ids = set((sched.get("filterTeamIds") or {}).get("value") or ())
+    if "rosterForTeamId" in params:
+        team_ids = {int(params["rosterForTeamId"])}
+    if "mSettings" in views:
+        out["settings"] = doc["settings"]
+    if "mTeam" in views:
+        out["teams"] = doc["teams"]
+    if "mRoster" in views:
+        out["teams"] = [{"id": t["id"], "roster": {"entries": entries(t["id"], period, seed)}}
+                        for t in doc["teams"] if not team_ids or t["id"] in team_ids]
+    if "mMatchup" in views or "mMatchupScore" in views:
+        schedule = []
+        for m in doc["schedule"]:
+            sides = [m[k]["teamId"] for k in ("home", "away") if m.get(k)]
+            if (periods and m["matchupPeriodId"] not in periods) or (team_ids and not team_ids & set(sides)):
+                continue
+            if "mMatchup" in views and m["matchupPeriodId"] == period:
+                m = {**m, **{k: {**m[k], "rosterForCurrentScoringPeriod": {"entries": entries(m[k]["teamId"], period, seed)}}
+                             for k in ("home", "away") if m.get(k)}}
+            schedule.append(m)
+        out["schedule"] = schedule
+    if "mTransactions2" in views:
+        types = set((((filters or {}).get("transactions") or {}).get("filterType") or {}).get("value") or ())
+        out["transactions"] = [t for t in transactions(len(doc["teams"]), period, seed) if not types or t["type"] in types] \
+            if period <= doc["scoringPeriodId"] else []
+    return out
+
+class FakeESPN(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, teams=12, week=9, periods=14, seed=0, season=2025, verbose=False, kickoff_ms=None):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.teams, self.week, self.periods, self.seed, self.season = teams, week, periods, seed, season
+        self.kickoff_ms = kickoff_ms or int(time.time() * 1000)  # the current week's first game
+        self.requests = 0
+        self.bytes = 0
+        self.verbose = verbose
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        """Value for ESPN_BASE_URL."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reset(self):
+        with self.lock:
+            self.requests = self.bytes = 0
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        srv = self.server
+        u = urlparse(self.path)
+        parts = u.path.strip("/").split("/")
+        q = parse_qs(u.query)
+        if "leagueHistory" in parts and "seasonId" in q:
+            lid, season = int(parts[parts.index("leagueHistory") + 1]), int(q["seasonId"][0])
+        elif "leagues" in parts and "seasons" in parts:
+            lid, season = int(parts[parts.index("leagues") + 1]), int(parts[parts.index("seasons") + 1])
+        elif parts[-2:-1] == ["seasons"] and "proTeamSchedules_wl" in q.get("view", ()):
+            return self._count(self._reply(200, pro_schedule(srv.week, srv.periods, srv.kickoff_ms)))
+        else:
+            return self._reply(404, {"messages": ["not found"]})
+        try:
+            filters = json.loads(self.headers.get("X-Fantasy-Filter") or "null")
+        except ValueError:
+            return self._reply(400, {"messages": ["bad X-Fantasy-Filter"]})
+        # Earlier seasons are complete (through a few playoff periods) and play out differently
+        past = season < srv.season
+        seed = srv.seed + (srv.season - season) * 7919
+        doc = league(srv.teams, srv.periods + 4 if past else srv.week, srv.periods, seed, lid, season)
+        body = payload(doc, q.get("view") or (), {k: v[0] for k, v in q.items() if k not in ("view", "seasonId")},
+                       filters, seed)
+        if "leagueHistory" in parts:
+            body = [body]
+        self._count(self._reply(200, body), filters)
+
+    def _count(self, n, filters=None):
+        srv = self.server
+        with srv.lock:
+            srv.requests += 1
+            srv.bytes += n
+        if srv.verbose:
+            print(f"[espn] {self.path} filtered={'yes' if filters else 'no'} bytes={n}")
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+    def log_message(self, *args):
+        pass
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Local stand-in ESPN fantasy API with synthetic leagues")
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--teams", type=int, default=12)
+    ap.add_argument("--week", type=int, default=9, help="current (in-progress) matchup period")
+    ap.add_argument("--periods", type=int, default=14, help="regular-season matchup periods")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    srv = FakeESPN(args.port, args.teams, args.week, args.periods, args.seed, verbose=True)
+    print(f"Serving synthetic {args.teams}-team league (week {args.week}) at {srv.url}  (set ESPN_BASE_URL)")
+    srv.serve_forever()
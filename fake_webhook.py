@@ -0,0 +1,99 @@
+"""
+Local stand-in for a Discord webhook. Records every posted payload, enforces Discord's
+embed limits (400 on violation) and can answer with 429s to exercise rate-limit handling.
+
+    python fake_webhook.py --port 8765 --rate-limit-every 3
+    WEBHOOK_URL=http://127.0.0.1:8765/webhook python weekly_power.py
+"""
+import json, argparse, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import webhook
+
+def violations(payload: dict) -> list:
+    embeds = payload.get("embeds") or []
+    errs = []
+    if len(embeds) > webhook.MAX_EMBEDS:
+        errs.append(f"{len(embeds)} embeds > {webhook.MAX_EMBEDS}")
+    if sum(webhook.embed_size(e) for e in embeds) > webhook.MAX_TOTAL:
+        errs.append(f"message exceeds {webhook.MAX_TOTAL} characters")
+    for i, e in enumerate(embeds):
+        if len(e.get("title") or "") > webhook.MAX_TITLE:
+            errs.append(f"embeds[{i}].title too long")
+        if len(e.get("description") or "") > webhook.MAX_DESCRIPTION:
+            errs.append(f"embeds[{i}].description too long")
+        fields = e.get("fields") or []
+        if len(fields) > webhook.MAX_FIELDS:
+            errs.append(f"embeds[{i}] has {len(fields)} fields")
+        for j, f in enumerate(fields):
+            if not f.get("name") or len(f["name"]) > webhook.MAX_FIELD_NAME:
+                errs.append(f"embeds[{i}].fields[{j}].name empty or too long")
+            if not f.get("value") or len(f["value"]) > webhook.MAX_FIELD_VALUE:
+                errs.append(f"embeds[{i}].fields[{j}].value empty or too long")
+    return errs
+
+class FakeWebhook(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, rate_limit_every=0, retry_after=0.05, verbose=False):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.posts = []           # accepted payloads, in order
+        self.requests = 0
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.verbose = verbose
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/webhook"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        srv = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with srv.lock:
+            srv.requests += 1
+            n = srv.requests
+        if srv.rate_limit_every and n % srv.rate_limit_every == 0:
+            return self._reply(429, {"message": "You are being rate limited.", "retry_after": srv.retry_after},
+                               {"Retry-After": str(srv.retry_after)})
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._reply(400, {"message": "invalid JSON"})
+        errs = violations(payload)
+        if errs:
+            return self._reply(400, {"message": "Invalid Form Body", "errors": errs})
+        with srv.lock:
+            srv.posts.append(payload)
+        if srv.verbose:
+            for e in payload.get("embeds") or []:
+                print(f"[webhook] {e.get('title')!r}: {len(e.get('fields') or [])} fields, {webhook.embed_size(e)} chars")
+        self._reply(204, None, {"X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "0"})
+
+    def _reply(self, status, body, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Local stand-in Discord webhook")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with a 429")
+    args = ap.parse_args()
+    srv = FakeWebhook(args.port, args.rate_limit_every, verbose=True)
+    print(f"Listening on {srv.url}")
+    srv.serve_forever()
@@ -0,0 +1,169 @@
+"""
+Multi-season archive for all-time stats. backfill() fetches every earlier season listed in
+status.previousSeasons in parallel (pre-2018 ones come from ESPN's leagueHistory endpoint),
+normalizes each into .jlbot/history/<league>/<season>.json and never fetches an archived
+season again. HistoryArchive reads those files, plus the current season from the season
+store, for head-to-head records, all-time high scores and franchise histories without any
+live requests.
+
+    python jlbot.py backfill
+"""
+import os, json, glob, traceback
+from concurrent.futures import ThreadPoolExecutor
+from espn_http import active_settings, env, get_views, use_league
+from models import Matchup, Team
+from telemetry import span
+
+HISTORY_DIR = os.environ.get("JLBOT_HISTORY_DIR", os.path.join(".jlbot", "history"))
+VIEWS = ["mSettings", "mTeam", "mMatchupScore"]
+WORKERS = 4
+REGULAR, PLAYOFF, CONSOLATION = 0, 1, 2  # game kinds
+
+def _dir(league_id):
+    return os.path.join(HISTORY_DIR, str(league_id))
+
+def normalize(doc: dict) -> dict | None:
+    """Compact season record: teams (name, owner, record, final rank) and every decided game. None if unfinished."""
+    periods = ((doc.get("settings") or {}).get("scheduleSettings") or {}).get("matchupPeriodCount") or 0
+    owners = {m.get("id"): (m.get("displayName") or f"{m.get('firstName', '')} {m.get('lastName', '')}".strip())
+              for m in doc.get("members") or ()}
+    teams = {}
+    for t in doc.get("teams") or ():
+        team = Team(t)
+        teams[str(team.id)] = {"name": team.name, "abbrev": team.abbrev, "owner": owners.get(team.owner) or team.owner,
+                               "wins": team.wins, "losses": team.losses, "ties": team.ties,
+                               "points_for": round(team.points_for, 2), "final_rank": t.get("rankCalculatedFinal") or 0}
+    games = []
+    for raw in doc.get("schedule") or ():
+        m = Matchup(raw)
+        if m.away is None:
+            continue
+        if m.winner not in ("HOME", "AWAY", "TIE"):
+            if not periods or m.period <= periods:
+                return None  # regular season not over yet
+            continue
+        tier = raw.get("playoffTierType") or "NONE"
+        kind = REGULAR if m.period <= periods or not periods else PLAYOFF if tier in ("NONE", "WINNERS_BRACKET") else CONSOLATION
+        games.append([m.period, m.home.team_id, m.away.team_id, round(m.home.score, 2), round(m.away.score, 2), kind])
+    return {"season": doc.get("seasonId"), "name": (doc.get("settings") or {}).get("name"), "periods": periods,
+            "teams": teams, "games": games}
+
+def backfill(workers: int = WORKERS, force: bool = False) -> list:
+    """Archive every finished earlier season that isn't archived yet. Returns the seasons written."""
+    lid, current = env("LEAGUE_ID"), int(env("SEASON_ID"))
+    status = get_views(["mSettings"]).get("status") or {}
+    seasons = sorted(int(s) for s in status.get("previousSeasons") or () if int(s) < current)
+    os.makedirs(_dir(lid), exist_ok=True)
+    missing = [s for s in seasons if force or not os.path.exists(os.path.join(_dir(lid), f"{s}.json"))]
+    base = active_settings()
+
+    def one(season):
+        try:
+            with use_league({**base, "SEASON_ID": str(season)}), span("history.season", season=season):
+                data = normalize(get_views(VIEWS))
+        except Exception:
+            print(f"[history] {season} failed:\n{traceback.format_exc()}")
+            return None
+        if data is None:
+            print(f"[history] {season} isn't finished; not archived")
+            return None
+        path = os.path.join(_dir(lid), f"{season}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+        return season
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing) or 1))) as pool:
+        done = [s for s in pool.map(one, missing) if s is not None]
+    print(f"[history] league {lid}: archived {done or 'nothing new'}; {len(seasons) - len(missing)} already on disk")
+    return done
+
+class HistoryArchive:
+    def __init__(self, league_id=None, path=None):
+        self.seasons = {}
+        for f in glob.glob(os.path.join(path or _dir(league_id or env("LEAGUE_ID")), "*.json")):
+            with open(f) as fh:
+                s = json.load(fh)
+            self.seasons[int(s["season"])] = s
+        # (season, period, home, away, home_pts, away_pts, kind)
+        self.games = [(season, *g) for season, s in sorted(self.seasons.items()) for g in s["games"]]
+
+    def __bool__(self):
+        return bool(self.seasons)
+
+    @classmethod
+    def load(cls, doc: dict, store) -> "HistoryArchive":
+        """Archived seasons plus the current season's stored weeks."""
+        archive = cls(store.league_id)
+        periods = ((doc.get("settings") or {}).get("scheduleSettings") or {}).get("matchupPeriodCount") or 0
+        archive.add_season(store.season, store.rows(), periods)
+        return archive
+
+    def add_season(self, season: int, rows: list, periods: int = 0):
+        """Fold in season_store rows (one per team per week); each game is added once."""
+        for r in rows:
+            if r["opponent_id"] is not None and r["team_id"] < r["opponent_id"]:
+                kind = PLAYOFF if periods and r["week"] > periods else REGULAR
+                self.games.append((season, r["week"], r["team_id"], r["opponent_id"], r["score"], r["opp_score"], kind))
+
+    def head_to_head(self, a: int, b: int, kinds=(REGULAR, PLAYOFF)) -> dict:
+        """{"wins": {a: n, b: n}, "ties", "games", "last": (season, period, winner or None)} over every meeting."""
+        wins, ties, last = {a: 0, b: 0}, 0, None
+        for season, period, h, w, hp, wp, kind in self.games:
+            if {h, w} != {a, b} or kind not in kinds:
+                continue
+            winner = h if hp > wp else w if wp > hp else None
+            if winner is None:
+                ties += 1
+            else:
+                wins[winner] += 1
+            if last is None or (season, period) > last[:2]:
+                last = (season, period, winner)
+        return {"wins": wins, "ties": ties, "games": sum(wins.values()) + ties, "last": last}
+
+    def high_scores(self, n: int = 10) -> list:
+        """[(points, season, period, team_id)] highest first, across every team's side of every game."""
+        sides = [(hp, season, period, h) for season, period, h, w, hp, wp, kind in self.games if kind != CONSOLATION]
+        sides += [(wp, season, period, w) for season, period, h, w, hp, wp, kind in self.games if kind != CONSOLATION]
+        return sorted(sides, key=lambda x: -x[0])[:n]
+
+    def score_rank(self, points: float) -> int:
+        """1-based all-time rank a score would hold (ties share the better rank)."""
+        return 1 + sum(1 for p, *_ in self.high_scores(len(self.games) * 2) if p > points)
+
+    def franchise(self, team_id: int) -> dict:
+        """All-time record, points, titles and per-season finishes for one team id."""
+        seasons = {y: s["teams"][str(team_id)] for y, s in sorted(self.seasons.items()) if str(team_id) in s["teams"]}
+        return {"seasons": seasons,
+                "wins": sum(t["wins"] for t in seasons.values()),
+                "losses": sum(t["losses"] for t in seasons.values()),
+                "ties": sum(t["ties"] for t in seasons.values()),
+                "points_for": round(sum(t["points_for"] for t in seasons.values()), 2),
+                "titles": sorted(y for y, t in seasons.items() if t["final_rank"] == 1)}
+
+    def franchise_line(self, team_id: int, name_for) -> str | None:
+        """'A — 54–38 over 7 seasons • 🏆 2019, 2022' from archived seasons, or None if the team has none."""
+        f = self.franchise(team_id)
+        if not f["seasons"]:
+            return None
+        ties = f"–{f['ties']}" if f["ties"] else ""
+        n = len(f["seasons"])
+        line = f"**{name_for(team_id)}** — {f['wins']}–{f['losses']}{ties} over {n} season{'s' if n != 1 else ''}"
+        if f["titles"]:
+            line += " • 🏆 " + ", ".join(map(str, f["titles"]))
+        return line
+
+    def rivalry_line(self, a: int, b: int, name_for) -> str | None:
+        """'All-time: A leads 7–4 (last: 2023 wk 5, A)' or None if they have never met."""
+        h2h = self.head_to_head(a, b)
+        if not h2h["games"]:
+            return None
+        wa, wb = h2h["wins"][a], h2h["wins"][b]
+        ties = f"–{h2h['ties']}" if h2h["ties"] else ""
+        if wa == wb:
+            text = f"All-time: tied {wa}–{wb}{ties}"
+        else:
+            lead = a if wa > wb else b
+            text = f"All-time: {name_for(lead)} leads {max(wa, wb)}–{min(wa, wb)}{ties}"
+        season, period, winner = h2h["last"]
+        return text + f" (last: {season} wk {period}, {name_for(winner) if winner else 'tie'})"
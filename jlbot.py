@@ -0,0 +1,108 @@
+"""
+Single entry point for the bot. Several commands can run in one invocation, and each imports
+only what it needs. Tool commands (backfill, probe, debug-*) run first, per league, so a probe
+can reorder the ESPN bases and a backfill can archive past seasons before the jobs fetch; the
+job commands (awards, power, transactions, preview) then share one fetch per league and post
+together (see runner.py). `live` runs last and keeps polling every league concurrently until
+its games are final (see live.py).
+
+    python jlbot.py awards power --leagues default L2
+    python jlbot.py backfill preview
+    python jlbot.py preview --dry-run
+    python jlbot.py probe debug-projection
+    python jlbot.py live --leagues default L2 --minutes 290
+"""
+import os, sys, argparse, traceback
+
+JOB_COMMANDS = ("awards", "power", "transactions", "preview")
+COMMANDS = JOB_COMMANDS + ("backfill", "probe", "debug-roster", "debug-projection", "live")
+
+def _backfill(args):
+    import history
+    history.backfill()
+
+def _probe(args):
+    import debug_league
+    debug_league.main()
+
+def _debug_roster(args):
+    import debug_roster
+    debug_roster.main(args.week)
+
+def _debug_projection(args):
+    import debug_projection
+    debug_projection.main()
+
+TOOLS = {"backfill": _backfill, "probe": _probe, "debug-roster": _debug_roster, "debug-projection": _debug_projection}
+
+def run_live(args) -> int:
+    """Live mode for every league at once. Returns the number of leagues that failed."""
+    from concurrent.futures import ThreadPoolExecutor
+    from espn_http import use_league
+    from runner import league_settings
+    import live
+    def per_league(path, name):
+        # One recording per league when several run at once: sunday.jsonl -> sunday-L2.jsonl
+        if not path or len(args.leagues) == 1:
+            return path
+        root, ext = os.path.splitext(path)
+        return f"{root}-{name}{ext}"
+    def one(name):
+        try:
+            with use_league(league_settings(name)):
+                live.run(args.dry_run, per_league(args.record, name), per_league(args.replay, name),
+                         args.max_polls, args.minutes)
+            return 0
+        except Exception:
+            print(f"[{name}] live failed:\n{traceback.format_exc()}", file=sys.stderr)
+            return 1
+    with ThreadPoolExecutor(max_workers=len(args.leagues)) as pool:
+        return sum(pool.map(one, args.leagues))
+
+def run_tools(commands: list, args) -> int:
+    """Run tool commands for every league in turn. Returns the number of failures."""
+    from espn_http import use_league
+    from runner import league_settings
+    failures = 0
+    for name in args.leagues:
+        with use_league(league_settings(name)):
+            for c in commands:
+                print(f"[{name}] {c}")
+                try:
+                    TOOLS[c](args)
+                except (Exception, SystemExit) as e:
+                    failures += 1
+                    msg = e if isinstance(e, SystemExit) else traceback.format_exc()
+                    print(f"[{name}] {c} failed: {msg}", file=sys.stderr)
+    return failures
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="jlbot", description="Justice League fantasy football bot")
+    ap.add_argument("commands", nargs="+", choices=COMMANDS, metavar="command",
+                    help=f"one or more of: {', '.join(COMMANDS)}")
+    ap.add_argument("--leagues", nargs="+", default=["default"],
+                    help="`default` for unprefixed env vars, or a prefix like L2 for L2_LEAGUE_ID etc.")
+    ap.add_argument("--workers", type=int, default=None, help="leagues processed concurrently (default: all)")
+    ap.add_argument("--dry-run", action="store_true", help="print embeds instead of posting")
+    ap.add_argument("--week", type=int, default=1, help="scoring period for debug-roster (default: 1)")
+    ap.add_argument("--record", help="live: append every poll to this JSONL file")
+    ap.add_argument("--replay", help="live: replay a recorded JSONL file instead of polling ESPN")
+    ap.add_argument("--max-polls", type=int, default=None, help="live: stop after this many polls")
+    ap.add_argument("--minutes", type=float, default=None, help="live: stop after this many minutes")
+    args = ap.parse_args(argv)
+
+    commands = list(dict.fromkeys(args.commands))
+    failures = 0
+    tools = [c for c in commands if c in TOOLS]
+    if tools:
+        failures += run_tools(tools, args)
+    jobs = [c for c in commands if c in JOB_COMMANDS]
+    if jobs:
+        from runner import run
+        failures += run(args.leagues, jobs, args.dry_run, args.workers)
+    if "live" in commands:
+        failures += run_live(args)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
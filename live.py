@@ -0,0 +1,260 @@
+"""
+Live scoring for game windows. Polls only the current matchup period; a poll whose raw bytes
+hash the same as the last one is skipped without parsing. Otherwise the matchups are parsed
+into a snapshot (live starter totals, live projections, every rostered player's points) and
+diffed against the previous one, and only meaningful events are posted: lead changes, the
+pre-game underdog taking over the live projection, bench players outscoring a starter they
+could have replaced, and finals. ESPN only sets a matchup's `winner` once the whole period
+closes (after Monday night), so a matchup counts as final as soon as every starter's NFL game
+is over, judged from the season's pro schedule (statsOfficial, or GAME_HOURS past kickoff).
+The interval backs off while nothing changes and tightens when a changing matchup is close
+with its last starters' games ending (crunch time).
+Polls can be recorded and replayed offline:
+
+    python jlbot.py live --record .jlbot/live/sunday.jsonl
+    python jlbot.py live --replay .jlbot/live/sunday.jsonl --dry-run
+"""
+import os, json, time, hashlib
+from espn_http import env, get_pro_schedule, get_raw, get_views, league_query
+from models import parse_schedule, parse_teams, team_namer
+from telemetry import span
+
+VIEWS = ["mMatchupScore", "mMatchup"]
+STATE_DIR = os.path.join(".jlbot", "live")
+# Poll interval bounds (seconds): BASE after a change, FAST when a changing matchup is in crunch
+# time, growing by BACKOFF per unchanged poll up to MAX.
+BASE_INTERVAL = float(os.environ.get("LIVE_INTERVAL", "60"))
+FAST_INTERVAL = float(os.environ.get("LIVE_FAST_INTERVAL", "20"))
+MAX_INTERVAL = float(os.environ.get("LIVE_MAX_INTERVAL", "600"))
+BACKOFF = 1.5
+CLOSE_POINTS = 10.0   # a matchup this close is "crunch time" once its remaining games are ending
+CRUNCH_STARTERS = 2   # ... or this few starters are left to play in them
+CRUNCH_MINUTES = 45   # how long before a game's expected end it counts as ending
+BENCH_MARGIN = 5.0    # bench player must beat the starter by this much to be worth a post
+GAME_HOURS = float(os.environ.get("LIVE_GAME_HOURS", "4"))  # a game not yet official is over this long after kickoff
+
+def pro_games(schedule: dict, scoring_period: int) -> dict:
+    """{proTeamId: (kickoff epoch seconds, stats official)} for one period of a proTeamSchedules_wl document."""
+    out = {}
+    for t in (schedule.get("settings") or {}).get("proTeams") or ():
+        for g in (t.get("proGamesByScoringPeriod") or {}).get(str(scoring_period)) or ():
+            out[t["id"]] = (g.get("date", 0) / 1000, bool(g.get("statsOfficial")))
+    return out
+
+def game_over(pro_team, games: dict, now: float) -> bool:
+    """A player's NFL game for the period is over (or there is none: bye week, free agent)."""
+    if pro_team not in games:
+        return True
+    kickoff, official = games[pro_team]
+    return official or now >= kickoff + GAME_HOURS * 3600
+
+def snapshot(doc: dict, week: int, scoring_period: int) -> dict:
+    """{matchup_id: {"winner", "final", "home": side, "away": side}} where side = {"team", "score", "proj", "players"}."""
+    out = {}
+    for m in parse_schedule(doc, week):
+        if m.away is None:
+            continue
+        sides = {}
+        for key, s in (("home", m.home), ("away", m.away)):
+            starters = [e for e in s.entries if e.starter]
+            # Starters' applied totals move during games; the side total may only settle at the end
+            score = sum(e.points(scoring_period) for e in starters) if starters else s.score
+            sides[key] = {"team": s.team_id, "score": round(score, 2), "proj": round(s.proj, 2),
+                          "players": [{"id": e.player_id, "name": e.name, "slot": e.slot, "starter": e.starter,
+                                       "points": round(e.points(scoring_period), 2),
+                                       "proj": round(e.projection(scoring_period), 2), "eligible": list(e.eligible_slots),
+                                       "pro_team": e.pro_team}
+                                      for e in s.entries]}
+        out[str(m.id)] = {"winner": m.winner, "final": m.winner not in (None, "UNDECIDED"), **sides}
+    return out
+
+def settle(snap: dict, games: dict | None, now: float) -> dict:
+    """Mark matchups final once every starter's game is over. `games` None (unknown schedule) leaves only ESPN's winner."""
+    out = {}
+    for mid, m in snap.items():
+        done = games is not None and all(game_over(pl["pro_team"], games, now)
+                                         for side in ("home", "away") for pl in m[side]["players"] if pl["starter"])
+        out[mid] = {**m, "final": m["winner"] not in (None, "UNDECIDED") or done}
+    return out
+
+def _leader(m, field="score"):
+    h, a = m["home"][field], m["away"][field]
+    return "home" if h > a else "away" if a > h else None
+
+def _other(side):
+    return "away" if side == "home" else "home"
+
+def diff(prev: dict | None, cur: dict, state: dict, name_for) -> list:
+    """
+    Events (one line each) between two snapshots. `state` carries the pre-game favorite per
+    matchup and the bench alerts already sent, so nothing is announced twice.
+    """
+    favorites = state.setdefault("favorites", {})
+    benched = set(state.setdefault("benched", []))
+    events = []
+    for mid, m in cur.items():
+        p = (prev or {}).get(mid)
+        fav = favorites.setdefault(mid, _leader(m, "proj"))
+        team = lambda side: f"**{name_for(m[side]['team'])}**"
+        line = lambda side: f"{m[side]['score']:.1f}–{m[_other(side)]['score']:.1f}"
+
+        if p is not None and not p.get("final") and m["final"]:
+            w = m["winner"].lower() if m["winner"] in ("HOME", "AWAY") else _leader(m)
+            if w is None:
+                events.append(f"🏁 Final: {team('home')} and {team('away')} tie {line('home')}")
+            else:
+                upset = " — upset!" if fav and w != fav else ""
+                events.append(f"🏁 Final: {team(w)} beats {team(_other(w))} {line(w)}{upset}")
+            continue
+        if p is None or m["final"]:
+            continue
+
+        lead, before = _leader(m), _leader(p)
+        if lead and before and lead != before:
+            events.append(f"🔀 {team(lead)} takes the lead over {team(_other(lead))}, {line(lead)}")
+        proj_lead, proj_before = _leader(m, "proj"), _leader(p, "proj")
+        if fav and proj_lead and proj_lead != fav and proj_before == fav:
+            events.append(f"⚠️ Upset watch: underdog {team(proj_lead)} is now projected to beat {team(fav)} "
+                          f"{m[proj_lead]['proj']:.1f}–{m[fav]['proj']:.1f}")
+
+        for side in ("home", "away"):
+            starters = [pl for pl in m[side]["players"] if pl["starter"]]
+            for b in m[side]["players"]:
+                key = f"{mid}:{m[side]['team']}:{b['id']}"
+                if b["starter"] or key in benched:
+                    continue
+                # The weakest starter this bench player could have replaced; a starter still
+                # short of their projection may yet catch up, so count them at the larger of the two
+                options = [s for s in starters if s["slot"] in b["eligible"]]
+                worst = min(options, key=lambda s: max(s["points"], s["proj"]), default=None)
+                if worst and b["points"] >= max(worst["points"], worst["proj"]) + BENCH_MARGIN:
+                    benched.add(key)
+                    events.append(f"🪑 {team(side)} has {b['name']} ({b['points']:.1f}) on the bench, "
+                                  f"outscoring starter {worst['name']} ({worst['points']:.1f})")
+    state["benched"] = sorted(benched)
+    return events
+
+def next_interval(interval: float, changed: bool, close: bool) -> float:
+    if changed:
+        return FAST_INTERVAL if close else BASE_INTERVAL
+    return min(MAX_INTERVAL, max(interval, FAST_INTERVAL) * BACKOFF)
+
+def _close(snap: dict, games: dict | None, now: float) -> bool:
+    """
+    Some open matchup is close and about to be decided: every starter still playing is already
+    in their game, and either few of them are left or all those games are near their expected
+    end. A 0–0 matchup at kickoff is not crunch time. Without a pro schedule, the margin alone decides.
+    """
+    for m in snap.values():
+        if m["final"] or abs(m["home"]["score"] - m["away"]["score"]) >= CLOSE_POINTS:
+            continue
+        if games is None:
+            return True
+        left = [games[pl["pro_team"]][0] for side in ("home", "away") for pl in m[side]["players"]
+                if pl["starter"] and not game_over(pl["pro_team"], games, now)]
+        if left and all(k <= now for k in left) and (
+                len(left) <= CRUNCH_STARTERS or all(now >= k + GAME_HOURS * 3600 - CRUNCH_MINUTES * 60 for k in left)):
+            return True
+    return False
+
+class Replay:
+    """
+    Serves a recorded game day: the league document and pro schedule, then each poll's raw body
+    in order. `now` is the current poll's recorded time, so game ends replay as they happened.
+    """
+    def __init__(self, path):
+        with open(path) as f:
+            lines = [json.loads(l) for l in f if l.strip()]
+        self.league = next(json.loads(l["body"]) for l in lines if l["kind"] == "league")
+        self.pro = next((json.loads(l["body"]) for l in lines if l["kind"] == "pro"), None)
+        self.polls = iter([(l["t"], l["body"].encode()) for l in lines if l["kind"] == "poll"])
+        self.now = None
+
+    def __call__(self):
+        self.now, body = next(self.polls, (self.now, None))
+        return body
+
+def _record(path, kind, body: bytes):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps({"t": time.time(), "kind": kind, "body": body.decode()}) + "\n")
+
+def _state_path(doc, week):
+    return os.path.join(STATE_DIR, f"{doc.get('id', env('LEAGUE_ID'))}-{doc.get('seasonId')}-{week}.json")
+
+def run(dry_run=False, record=None, replay=None, max_polls=None, max_minutes=None, sleep=time.sleep) -> int:
+    """
+    Poll until every matchup is final (or the replay / poll / time budget runs out), posting
+    each poll's events as one embed. Returns the number of events.
+    """
+    from webhook import post
+    if replay:
+        source = Replay(replay)
+        doc, pro, clock = source.league, source.pro, lambda: source.now
+    else:
+        doc, pro, clock = get_views(["mSettings", "mTeam"]), get_pro_schedule(), time.time
+        if record:
+            _record(record, "league", json.dumps(doc).encode())
+            _record(record, "pro", json.dumps(pro).encode())
+    week = doc["status"]["currentMatchupPeriod"]
+    scoring_period = doc.get("scoringPeriodId") or week
+    name_for = team_namer(parse_teams(doc))
+    games = pro_games(pro, scoring_period) if pro is not None else None
+    if not replay:
+        query = league_query(matchup_periods=[week], scoring_period=scoring_period)
+        source = lambda: get_raw(VIEWS, **query)
+
+    # Resume where a previous run in this window stopped (not when replaying)
+    state_file = None if replay else _state_path(doc, week)
+    state = {}
+    if state_file and os.path.exists(state_file):
+        with open(state_file) as f:
+            state = json.load(f)
+    prev, digest = state.pop("snapshot", None), state.pop("digest", None)
+
+    interval, polls, total = BASE_INTERVAL, 0, 0
+    deadline = time.time() + max_minutes * 60 if max_minutes else None
+    while max_polls is None or polls < max_polls:
+        with span("live.poll", week=week) as info:
+            body = source()
+            if body is None:
+                break
+            polls += 1
+            if record:
+                _record(record, "poll", body)
+            h = hashlib.blake2b(body, digest_size=16).hexdigest()
+            info["changed"] = h != digest
+            cur = prev
+            if h != digest:
+                digest = h
+                with span("parse", what="live"):
+                    cur = snapshot(json.loads(body), week, scoring_period)
+            # Games end on the clock too, so finality is re-checked even when the body is unchanged
+            now = clock()
+            cur = settle(cur, games, now) if cur is not None else None
+            events = diff(prev, cur, state, name_for) if cur is not None else []
+            changed = prev is None or cur != prev
+            prev = cur
+            info["events"] = len(events)
+
+        if events:
+            total += len(events)
+            embed = {"title": f"Live — Week {week}", "description": "\n".join(events), "color": 0xE63946}
+            if dry_run:
+                print(json.dumps(embed, indent=2, ensure_ascii=False))
+            else:
+                post([embed])
+        if state_file:
+            os.makedirs(STATE_DIR, exist_ok=True)
+            with open(state_file, "w") as f:
+                json.dump({**state, "snapshot": prev, "digest": digest}, f)
+
+        if prev and all(m["final"] for m in prev.values()):
+            break
+        interval = next_interval(interval, changed, _close(prev or {}, games, now))
+        if deadline and time.time() + interval > deadline:
+            break
+        if not replay:
+            sleep(interval)
+    print(f"[live] week {week}: {polls} polls, {total} events")
+    return total
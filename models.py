@@ -0,0 +1,129 @@
+"""
+Slotted views over ESPN league payloads. Parse once, then read attributes instead of
+`.get(...) or {}` chains; each RosterEntry indexes its stats by (period, source, split).
+"""
+from team_utils import team_display
+
+BENCH, IR = 20, 21          # lineupSlotId; FLEX(23) **IS a starter** on ESPN
+ACTUAL, PROJECTION = 0, 1   # statSourceId
+TOTAL = 1                   # statSplitTypeId: single-period total
+
+def _first_float(d, keys, default=0.0):
+    for k in keys:
+        v = d.get(k)
+        if v is not None:
+            return float(v)
+    return default
+
+class StatLine:
+    __slots__ = ("period", "source", "split", "applied")
+
+    def __init__(self, period, source, split, applied):
+        self.period, self.source, self.split, self.applied = period, source, split, applied
+
+    def __repr__(self):
+        return f"StatLine(period={self.period}, source={self.source}, split={self.split}, applied={self.applied})"
+
+class RosterEntry:
+    __slots__ = ("player_id", "name", "slot", "position", "pro_team", "eligible_slots",
+                 "applied_total", "acquisition", "stats", "_index")
+
+    def __init__(self, e: dict):
+        ppe = e.get("playerPoolEntry") or {}
+        p = ppe.get("player") or {}
+        self.player_id = p.get("id", e.get("playerId"))
+        self.name = p.get("fullName") or f"Player {self.player_id}"
+        self.slot = e.get("lineupSlotId")
+        self.position = p.get("defaultPositionId")
+        self.pro_team = p.get("proTeamId")  # 0 = free agent
+        self.eligible_slots = tuple(p.get("eligibleSlots") or ())
+        at = ppe.get("appliedStatTotal")
+        self.applied_total = float(at) if at is not None else None
+        self.acquisition = e.get("acquisitionType")
+        self.stats = tuple(
+            StatLine(s.get("scoringPeriodId"), s.get("statSourceId"), s.get("statSplitTypeId"),
+                     float(s.get("appliedTotal") or 0.0))
+            for s in (p.get("stats") or ())
+        )
+        index = {}
+        for s in self.stats:
+            index.setdefault((s.period, s.source, s.split), s.applied)
+        self._index = index
+
+    @property
+    def starter(self) -> bool:
+        return self.slot not in (BENCH, IR, None)
+
+    def stat(self, period, source=ACTUAL, split=TOTAL, default=None):
+        return self._index.get((period, source, split), default)
+
+    def projection(self, period) -> float:
+        return self.stat(period, PROJECTION, TOTAL, 0.0)
+
+    def points(self, period=None) -> float:
+        """Actual points for the period: appliedStatTotal when ESPN attaches it, else the period's actual stat line."""
+        if self.applied_total is not None:
+            return self.applied_total
+        return self.stat(period, ACTUAL, TOTAL, 0.0)
+
+def parse_entries(roster: dict | None) -> list:
+    return [RosterEntry(e) for e in ((roster or {}).get("entries") or ())]
+
+class Team:
+    __slots__ = ("id", "name", "abbrev", "owner", "wins", "losses", "ties", "points_for", "entries")
+
+    def __init__(self, t: dict):
+        self.id = t.get("id")
+        self.name = team_display(t)
+        self.abbrev = t.get("abbrev")
+        self.owner = t.get("primaryOwner")
+        rec = ((t.get("record") or {}).get("overall")) or {}
+        self.wins = int(rec.get("wins", 0))
+        self.losses = int(rec.get("losses", 0))
+        self.ties = int(rec.get("ties", 0))
+        pf = rec.get("pointsFor")
+        self.points_for = float(pf) if pf is not None else _first_float(t, ("points", "pointsFor"))
+        self.entries = parse_entries(t.get("roster"))
+
+class MatchupSide:
+    __slots__ = ("team_id", "score", "proj", "entries")
+
+    def __init__(self, side: dict):
+        self.team_id = side.get("teamId")
+        self.score = _first_float(side, ("totalPoints", "appliedTotal", "points"))
+        self.proj = _first_float(side, ("totalProjectedPointsLive", "totalProjectedPoints", "projectedTotal"))
+        self.entries = parse_entries(side.get("rosterForCurrentScoringPeriod"))
+
+class Matchup:
+    __slots__ = ("id", "period", "home", "away", "winner")
+
+    def __init__(self, m: dict):
+        self.id = m.get("id")
+        self.period = m.get("matchupPeriodId")
+        self.home = MatchupSide(m.get("home") or {})
+        self.away = MatchupSide(m["away"]) if m.get("away") else None  # byes have no away side
+        self.winner = m.get("winner")
+
+    @property
+    def sides(self):
+        return (self.home, self.away) if self.away else (self.home,)
+
+def parse_teams(doc: dict) -> dict:
+    """{team_id: Team} from an mTeam (or mRoster) document."""
+    return {t.id: t for t in map(Team, doc.get("teams") or ())}
+
+def parse_schedule(doc: dict, period: int | None = None) -> list:
+    """Matchups from an mMatchup document, optionally only those in one matchup period."""
+    return [Matchup(m) for m in doc.get("schedule") or ()
+            if period is None or m.get("matchupPeriodId") == period]
+
+def parse_roster(doc: dict) -> dict:
+    """{team_id: [RosterEntry]} from an mRoster document."""
+    return {t.get("id"): parse_entries(t.get("roster")) for t in doc.get("teams") or ()}
+
+def team_namer(teams: dict):
+    """name_for(team_id) over parsed teams, falling back to 'Team {id}'."""
+    def name_for(tid):
+        t = teams.get(tid)
+        return t.name if t else f"Team {tid}"
+    return name_for
@@ -0,0 +1,133 @@
+"""
+Columnar per-player, per-week season store. Every rostered player of every completed week is
+one row across NumPy columns (team, week, player, slot, points, proj, eligible-slot bitmask,
+acquisition) saved as .npy files under .jlbot/players/<league>-<season>/ and memory-mapped on
+load, so season-long questions (waiver pickups, start/sit mistakes) are a few
+vector operations. Rows come from the same mMatchup rosters season_store.sync() already
+streams; meta.json holds the ingested weeks, the row count and player names.
+"""
+import os, json
+import numpy as np
+from espn_http import env
+from models import BENCH, IR
+
+PLAYER_DIR = os.environ.get("JLBOT_PLAYER_DIR", os.path.join(".jlbot", "players"))
+COLUMNS = {"team": np.int16, "week": np.int16, "player": np.int64, "slot": np.int16,
+           "points": np.float32, "proj": np.float32, "eligible": np.uint64, "acquisition": np.int8}
+ACQUISITIONS = ("", "DRAFT", "ADD", "TRADE")  # acquisition column codes; 0 = unknown
+
+def eligible_mask(slots) -> int:
+    m = 0
+    for s in slots:
+        if 0 <= s < 64:
+            m |= 1 << s
+    return m
+
+def player_records(team_id: int, week: int, entries) -> list:
+    """Store rows (dicts keyed like COLUMNS, plus "name") for one team's parsed RosterEntry list."""
+    return [{"team": team_id, "week": week, "player": e.player_id, "slot": e.slot if e.slot is not None else BENCH,
+             "points": e.points(week), "proj": e.projection(week), "eligible": eligible_mask(e.eligible_slots),
+             "acquisition": ACQUISITIONS.index(e.acquisition) if e.acquisition in ACQUISITIONS else 0,
+             "name": e.name}
+            for e in entries]
+
+class PlayerStore:
+    def __init__(self, path=None, league_id=None, season=None):
+        self.path = path or os.path.join(PLAYER_DIR, f"{league_id or env('LEAGUE_ID')}-{season or env('SEASON_ID')}")
+        self._load()
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.path, "meta.json")) as f:
+                self.meta = json.load(f)
+        except (OSError, ValueError):
+            self.meta = {"weeks": [], "rows": 0, "names": {}}
+        n = self.meta["rows"]
+        # Columns can run ahead of meta.json if a write was interrupted; meta's row count wins
+        self.cols = {c: np.load(os.path.join(self.path, f"{c}.npy"), mmap_mode="r")[:n] if n else np.zeros(0, t)
+                     for c, t in COLUMNS.items()}
+
+    def __getitem__(self, column):
+        return self.cols[column]
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def weeks(self) -> list:
+        return sorted(self.meta["weeks"])
+
+    def name(self, player_id) -> str:
+        return self.meta["names"].get(str(player_id), f"Player {player_id}")
+
+    def ingest_week(self, week: int, records: list):
+        """Append a completed week's player rows. Weeks already stored are left alone."""
+        if week in self.meta["weeks"] or not records:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        new = {c: np.concatenate([np.asarray(self.cols[c]), np.array([r[c] for r in records], dtype=t)])
+               for c, t in COLUMNS.items()}
+        self.cols = {}  # drop the maps before the files underneath are replaced
+        for c, a in new.items():
+            tmp = os.path.join(self.path, f"{c}.tmp.npy")
+            np.save(tmp, a)
+            os.replace(tmp, os.path.join(self.path, f"{c}.npy"))
+        names = {**self.meta["names"], **{str(r["player"]): r["name"] for r in records}}
+        meta = {"weeks": sorted(self.meta["weeks"] + [week]), "rows": len(new["week"]), "names": names}
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+        self._load()
+
+    def _starter(self):
+        slot = self["slot"]
+        return (slot != BENCH) & (slot != IR)
+
+    def best_pickups(self, n: int = 1) -> list:
+        """[(team_id, player_id, points while started, weeks started)] for added (waiver/FA) players, best first."""
+        keep = (self["acquisition"] == ACQUISITIONS.index("ADD")) & self._starter()
+        if not keep.any():
+            return []
+        keys = np.stack([self["team"][keep].astype(np.int64), self["player"][keep]], axis=1)
+        uniq, inv = np.unique(keys, axis=0, return_inverse=True)
+        inv = inv.ravel()
+        pts = np.bincount(inv, weights=self["points"][keep])
+        weeks = np.bincount(inv)
+        order = np.argsort(-pts, kind="stable")[:n]
+        return [(int(uniq[i, 0]), int(uniq[i, 1]), float(pts[i]), int(weeks[i])) for i in order]
+
+    def worst_start_sit(self, n: int = 1) -> list:
+        """
+        [(week, team_id, benched_player, bench_pts, started_player, start_pts)] — the biggest gaps
+        where a bench player outscored a starter in a slot they were eligible for, worst first.
+        """
+        if not len(self):
+            return []
+        team, week, slot = self["team"].astype(np.int64), self["week"].astype(np.int64), self["slot"]
+        # Pad every team-week into one row of a (groups, roster) matrix, then compare all pairs at once
+        group = week * 10_000 + team
+        order = np.argsort(group, kind="stable")
+        g, start = np.unique(group[order], return_index=True)
+        gi = np.repeat(np.arange(len(g)), np.diff(np.append(start, len(order))))
+        pos = np.arange(len(order)) - start[gi]
+        width = int(pos.max()) + 1
+        idx = np.full((len(g), width), -1)
+        idx[gi, pos] = order
+        valid = idx >= 0
+        pts = np.where(valid, self["points"][idx], np.nan)
+        bench = valid & (slot[idx] == BENCH)
+        starter = valid & self._starter()[idx]
+        slot_bit = np.where(starter, np.left_shift(np.uint64(1), np.clip(slot[idx], 0, 63).astype(np.uint64)), 0)
+        elig = self["eligible"][idx]
+        fits = (elig[:, :, None] & slot_bit[:, None, :]) != 0          # bench i could fill starter j's slot
+        gap = np.where(bench[:, :, None] & starter[:, None, :] & fits, pts[:, :, None] - pts[:, None, :], -np.inf)
+        flat = np.argsort(-gap, axis=None, kind="stable")[:n]
+        out = []
+        for k in flat:
+            gk, i, j = np.unravel_index(k, gap.shape)
+            if not np.isfinite(gap[gk, i, j]) or gap[gk, i, j] <= 0:
+                break
+            b, s = idx[gk, i], idx[gk, j]
+            out.append((int(week[b]), int(team[b]), int(self["player"][b]), float(pts[gk, i]),
+                        int(self["player"][s]), float(pts[gk, j])))
+        return out
@@ -0,0 +1,124 @@
+"""
+Monte Carlo playoff odds. Each team's weekly score is modeled as a normal distribution
+fitted to its stored weeks (shrunk toward the league when there are few of them), the
+remaining regular-season schedule is played out for every simulation at once with NumPy,
+and standings are ranked by wins then points-for. Simulations run in fixed-size chunks with
+spawned seeds, so results are reproducible whether chunks run inline or on a process pool.
+The pool never forks: jobs run on runner/live threads, and a forked child could inherit a lock
+(HTTP session, telemetry) held by another thread.
+"""
+import os, multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from power_engine import score_matrix
+from telemetry import traced
+
+SIMS = int(os.environ.get("PLAYOFF_SIMS", "20000"))
+WORKERS = int(os.environ.get("PLAYOFF_WORKERS", "1"))
+SEED = int(os.environ.get("PLAYOFF_SEED", "2024"))
+CHUNK = 10000
+SHRINK_WEEKS = 3  # pseudo-weeks of league-average data mixed into each team's fit
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+def regular_season(doc: dict):
+    """(regular season matchup periods, playoff team count, byes) from mSettings."""
+    sched = (doc.get("settings") or {}).get("scheduleSettings") or {}
+    periods = int(sched.get("matchupPeriodCount") or 0)
+    playoff = int(sched.get("playoffTeamCount") or 0)
+    bracket = 1 << max(playoff - 1, 0).bit_length() if playoff else 0
+    return periods, playoff, bracket - playoff
+
+def fit_distributions(scores):
+    """Per-team (mean, std) from a (teams, weeks) score matrix with NaN for missing weeks."""
+    valid = ~np.isnan(scores)
+    n = valid.sum(axis=1)
+    league_mu = np.nanmean(scores)
+    league_var = np.nanvar(scores) or 1.0
+    s = np.where(valid, scores, 0.0)
+    mu_t = s.sum(axis=1) / np.maximum(n, 1)
+    var_t = np.where(valid, (scores - mu_t[:, None]) ** 2, 0.0).sum(axis=1) / np.maximum(n, 1)
+    mu = (n * mu_t + SHRINK_WEEKS * league_mu) / (n + SHRINK_WEEKS)
+    var = (n * var_t + SHRINK_WEEKS * league_var) / (n + SHRINK_WEEKS)
+    return mu, np.sqrt(var)
+
+def _simulate(args):
+    seed, n, mu, sigma, games, periods, wins0, pf0, playoff, byes = args
+    rng = np.random.default_rng(seed)
+    teams = len(mu)
+    gh, ga, gp = games[:, 0], games[:, 1], games[:, 2]
+    draws = rng.normal(mu[None, :, None], sigma[None, :, None], size=(n, teams, periods))
+    h, a = draws[:, gh, gp], draws[:, ga, gp]
+    home_won = (h > a).astype(float)
+
+    H = np.zeros((len(games), teams)); H[np.arange(len(games)), gh] = 1
+    A = np.zeros((len(games), teams)); A[np.arange(len(games)), ga] = 1
+    wins = wins0 + home_won @ H + (1.0 - home_won) @ A
+    pf = pf0 + h @ H + a @ A
+
+    order = np.argsort(-(wins * 1e6 + pf), axis=1, kind="stable")
+    rank = np.empty_like(order)
+    rank[np.arange(n)[:, None], order] = np.arange(teams)
+    return (rank < playoff).sum(axis=0), (rank < byes).sum(axis=0), (rank == teams - 1).sum(axis=0)
+
+def simulate(mu, sigma, games, periods, wins0, pf0, playoff, byes, sims=None, workers=None, seed=None):
+    """
+    Play out `games` ((home_idx, away_idx, period_idx) rows) `sims` times.
+    Returns (teams, 3) probabilities of making the playoffs, earning a bye and finishing last.
+    """
+    sims = sims or SIMS
+    workers = workers or WORKERS
+    seeds = np.random.SeedSequence(SEED if seed is None else seed).spawn(-(-sims // CHUNK))
+    jobs = [(s, min(CHUNK, sims - i * CHUNK), mu, sigma, games, periods, wins0, pf0, playoff, byes)
+            for i, s in enumerate(seeds)]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(START_METHOD)) as pool:
+            parts = list(pool.map(_simulate, jobs))
+    else:
+        parts = [_simulate(j) for j in jobs]
+    counts = np.stack([sum(p[k] for p in parts) for k in range(3)], axis=1)
+    return counts / sims
+
+@traced("odds")
+def league_odds(doc: dict, synced: dict, **kw) -> dict | None:
+    """
+    {team_id: {"playoffs", "bye", "last"}} for the rest of the regular season, from played weeks
+    and the remaining mMatchup schedule. `synced` is season_store.sync()'s {week: rows}: stored
+    weeks plus past ones ESPN hasn't decided yet, which count at their actual scores rather than
+    dropping out of both the record and the schedule. None when there is nothing left to simulate
+    or no history.
+    """
+    periods, playoff, byes = regular_season(doc)
+    rows = [r for w in sorted(synced) for r in synced[w]]
+    if not rows or not playoff:
+        return None
+    team_ids, weeks, scores, results = score_matrix(rows)
+    played = set(weeks)
+    remaining = [m for m in doc.get("schedule") or ()
+                 if m.get("away") and m.get("matchupPeriodId") not in played
+                 and m.get("matchupPeriodId", 0) <= periods]
+    if not remaining:
+        return None
+
+    ti = {t: i for i, t in enumerate(team_ids)}
+    pi = {p: j for j, p in enumerate(sorted({m["matchupPeriodId"] for m in remaining}))}
+    games = np.array([(ti[m["home"]["teamId"]], ti[m["away"]["teamId"]], pi[m["matchupPeriodId"]])
+                      for m in remaining if m["home"]["teamId"] in ti and m["away"]["teamId"] in ti], dtype=int)
+    if not len(games):
+        return None
+    mu, sigma = fit_distributions(scores)
+    wins0 = np.nansum(results, axis=1)
+    pf0 = np.nansum(scores, axis=1)
+    probs = simulate(mu, sigma, games, len(pi), wins0, pf0, min(playoff, len(team_ids)), byes, **kw)
+    return {tid: {"playoffs": p[0], "bye": p[1], "last": p[2]} for tid, p in zip(team_ids, probs)}
+
+def odds_field(odds: dict, name_for) -> dict:
+    """Embed field listing teams by playoff probability."""
+    lines = []
+    for tid, o in sorted(odds.items(), key=lambda kv: (-kv[1]["playoffs"], -kv[1]["bye"], kv[1]["last"])):
+        line = f"{name_for(tid)} — {o['playoffs'] * 100:.0f}% playoffs"
+        if o["bye"] >= 0.005:
+            line += f" • {o['bye'] * 100:.0f}% bye"
+        if o["last"] >= 0.005:
+            line += f" • {o['last'] * 100:.0f}% last"
+        lines.append(line)
+    return {"name": "🎲 Playoff odds 🎲", "value": "\n".join(lines)[:1024], "inline": False}
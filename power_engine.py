@@ -0,0 +1,89 @@
+"""
+Season metrics over a teams x weeks score matrix. Every metric is computed for all teams
+and all weeks at once (cumulative through each week), so the final column is the current
+table and earlier columns backfill every prior week's rankings for free.
+"""
+import numpy as np
+
+METRICS = ("pf", "wins", "allplay", "expected", "luck", "median", "form")
+
+def score_matrix(rows):
+    """
+    Store rows -> (team_ids, weeks, scores, results). scores/results are float arrays shaped
+    (teams, weeks); results hold 1/0.5/0 for W/T/L and NaN for byes or missing weeks.
+    """
+    team_ids = sorted({r["team_id"] for r in rows})
+    weeks = sorted({r["week"] for r in rows})
+    ti = {t: i for i, t in enumerate(team_ids)}
+    wi = {w: j for j, w in enumerate(weeks)}
+    scores = np.full((len(team_ids), len(weeks)), np.nan)
+    results = np.full_like(scores, np.nan)
+    outcome = {"W": 1.0, "T": 0.5, "L": 0.0}
+    for r in rows:
+        i, j = ti[r["team_id"]], wi[r["week"]]
+        scores[i, j] = r["score"]
+        if r["result"] in outcome:
+            results[i, j] = outcome[r["result"]]
+    return team_ids, weeks, scores, results
+
+def season_metrics(scores, results, form_window: int = 3) -> dict:
+    """Cumulative (teams, weeks) arrays for every name in METRICS, plus all-play W/L/T counts."""
+    valid = ~np.isnan(scores)
+    s = np.where(valid, scores, -np.inf)
+    pair = valid[:, None, :] & valid[None, :, :]
+    ap_w = ((s[:, None, :] > s[None, :, :]) & pair).sum(axis=1).astype(float)
+    ap_l = ((s[:, None, :] < s[None, :, :]) & pair).sum(axis=1).astype(float)
+    ap_t = pair.sum(axis=1) - 1 - ap_w - ap_l
+    ap_t[~valid] = 0
+    opponents = np.maximum(valid.sum(axis=0) - 1, 1)
+
+    expected = np.where(valid, (ap_w + 0.5 * ap_t) / opponents, 0.0)
+    median = np.nanmedian(np.where(valid, scores, np.nan), axis=0) if scores.size else np.zeros(0)
+    vs_median = np.where(valid, (scores > median) + 0.5 * (scores == median), 0.0)
+    won = np.nan_to_num(results, nan=0.0)
+
+    cum = lambda a: np.cumsum(a, axis=1)
+    pts = np.where(valid, scores, 0.0)
+    cpts, cgames = cum(pts), cum(valid)
+    k = max(1, form_window)
+    lag_pts = np.concatenate([np.zeros((pts.shape[0], k)), cpts], axis=1)[:, :cpts.shape[1]]
+    lag_games = np.concatenate([np.zeros((pts.shape[0], k)), cgames], axis=1)[:, :cgames.shape[1]]
+
+    games = np.maximum(cgames, 1)
+    cap_w, cap_l, cap_t = cum(ap_w), cum(ap_l), cum(ap_t)
+    return {
+        "pf": cpts,
+        "wins": cum(won),
+        "allplay": (cap_w + 0.5 * cap_t) / np.maximum(cap_w + cap_l + cap_t, 1),
+        "expected": cum(expected),
+        "luck": cum(won) - cum(np.where(~np.isnan(results), expected, 0.0)),
+        "median": cum(vs_median) / games,
+        "form": (cpts - lag_pts) / np.maximum(cgames - lag_games, 1),
+        "allplay_w": cap_w, "allplay_l": cap_l, "allplay_t": cap_t,
+    }
+
+def parse_weights(spec: str) -> dict:
+    """'pf=0.5,allplay=0.3,form=0.2' -> {'pf': 0.5, ...}; unknown metric names are rejected."""
+    weights = {}
+    for part in filter(None, (p.strip() for p in (spec or "").split(","))):
+        name, _, w = part.partition("=")
+        name = name.strip()
+        if name not in METRICS:
+            raise ValueError(f"unknown power metric {name!r} (choose from {', '.join(METRICS)})")
+        weights[name] = float(w or 1.0)
+    return weights or {"pf": 1.0}
+
+def composite(metrics: dict, weights: dict):
+    """Weighted sum of per-week z-scores across teams -> (teams, weeks) rating; higher is better."""
+    total = None
+    for name, w in weights.items():
+        a = metrics[name]
+        sd = a.std(axis=0)
+        z = (a - a.mean(axis=0)) / np.where(sd > 0, sd, 1.0)
+        total = w * z if total is None else total + w * z
+    return total
+
+def ranking_order(metrics: dict, weights: dict):
+    """(teams, weeks) array; column j lists team indices best-first as of week j."""
+    rating = composite(metrics, weights)
+    return np.argsort(-rating, axis=0, kind="stable")
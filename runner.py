@@ -0,0 +1,70 @@
+"""
+Run several jobs for several leagues in one process. Each league's settings come from
+prefixed environment variables (`default` = unprefixed LEAGUE_ID/SEASON_ID/..., `L2` =
+L2_LEAGUE_ID/L2_SEASON_ID/...). Per league, mSettings/mTeam and the remaining mMatchup
+schedule are fetched once and shared by every job, the resulting embeds go out together,
+and leagues run concurrently.
+
+    python jlbot.py awards power --leagues default L2
+"""
+import os, sys, json, traceback
+from concurrent.futures import ThreadPoolExecutor
+from espn_http import get_views, use_league
+
+SETTINGS = ("LEAGUE_ID", "SEASON_ID", "ESPN_S2", "SWID", "WEBHOOK_URL", "TIMEZONE",
+            "POWER_WEIGHTS", "POWER_FORM_WEEKS", "ESPN_BASE_URL")
+SHARED_VIEWS = ["mSettings", "mTeam"]
+SCHEDULE_JOBS = {"power", "preview"}  # jobs that need the remaining schedule
+
+def _build_awards(doc):
+    from weekly_awards import build_awards_embed
+    return build_awards_embed(doc)
+
+def _build_power(doc):
+    from weekly_power import build_power
+    return build_power(doc)
+
+def _build_transactions(doc):
+    from weekly_transactions import build_transactions
+    return build_transactions(doc)
+
+def _build_preview(doc):
+    from weekly_preview import build_preview
+    return build_preview(doc)
+
+JOBS = {"awards": _build_awards, "power": _build_power, "transactions": _build_transactions, "preview": _build_preview}
+
+def league_settings(name: str) -> dict:
+    """Settings for `default` (unprefixed env vars) or a prefix such as `L2` (L2_LEAGUE_ID, ...)."""
+    prefix = "" if name == "default" else f"{name}_"
+    return {**{k: os.environ.get(prefix + k) for k in SETTINGS}, "LEAGUE_NAME": name}
+
+def run_league(name: str, jobs: list, dry_run: bool = False) -> list:
+    """Fetch the shared views once, build each job's embed from them and deliver them together."""
+    from webhook import post
+    with use_league(league_settings(name)):
+        doc = get_views(SHARED_VIEWS)
+        if SCHEDULE_JOBS & set(jobs):
+            from season_store import upcoming_schedule
+            doc = {**doc, "schedule": upcoming_schedule(doc)}
+        embeds = [JOBS[j](doc) for j in jobs]
+        if dry_run:
+            print(json.dumps({"league": name, "embeds": embeds}, indent=2, ensure_ascii=False))
+        else:
+            post(embeds)
+            print(f"[{name}] posted:", ", ".join(e.get("title", "?") for e in embeds))
+    return embeds
+
+def run(leagues: list, jobs: list, dry_run: bool = False, workers: int | None = None) -> int:
+    """Run every league on a thread pool; one failing league doesn't stop the others. Returns failures."""
+    def one(name):
+        try:
+            run_league(name, jobs, dry_run)
+            return None
+        except Exception:
+            return f"[{name}] failed:\n{traceback.format_exc()}"
+    with ThreadPoolExecutor(max_workers=workers or len(leagues)) as pool:
+        errors = [e for e in pool.map(one, leagues) if e]
+    for e in errors:
+        print(e, file=sys.stderr)
+    return len(errors)
@@ -0,0 +1,225 @@
+"""
+Per-team, per-week results persisted in SQLite (.jlbot/season.sqlite, restored between
+Actions runs with the rest of .jlbot). A week is ingested once, after its matchup period
+is over, and never recomputed; weekly jobs only fetch periods the store doesn't have yet.
+"""
+import os, time, sqlite3
+from espn_http import SCHEDULE, env, get_stream, get_views, league_query
+from lineup import optimal_lineup
+from models import PROJECTION, Matchup, parse_roster
+from telemetry import event, span
+
+STORE_PATH = os.environ.get("JLBOT_STORE", os.path.join(".jlbot", "season.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS team_week (
+    league_id      TEXT    NOT NULL,
+    season         INTEGER NOT NULL,
+    week           INTEGER NOT NULL,
+    team_id        INTEGER NOT NULL,
+    opponent_id    INTEGER,
+    score          REAL    NOT NULL,
+    opp_score      REAL,
+    proj           REAL    NOT NULL,
+    actual_lineup  REAL,
+    optimal_lineup REAL,
+    result         TEXT,            -- 'W', 'L', 'T'; NULL on a bye
+    PRIMARY KEY (league_id, season, week, team_id)
+);
+CREATE TABLE IF NOT EXISTS weeks (
+    league_id   TEXT    NOT NULL,
+    season      INTEGER NOT NULL,
+    week        INTEGER NOT NULL,
+    ingested_at REAL    NOT NULL,
+    PRIMARY KEY (league_id, season, week)
+);
+"""
+_COLUMNS = ("week", "team_id", "opponent_id", "score", "opp_score", "proj", "actual_lineup", "optimal_lineup", "result")
+
+class SeasonStore:
+    def __init__(self, path=None, league_id=None, season=None):
+        self.path = path or STORE_PATH
+        self.league_id = str(league_id or env("LEAGUE_ID"))
+        self.season = int(season or env("SEASON_ID"))
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def weeks(self) -> list:
+        cur = self.db.execute("SELECT week FROM weeks WHERE league_id=? AND season=? ORDER BY week",
+                              (self.league_id, self.season))
+        return [r["week"] for r in cur]
+
+    def has_week(self, week: int) -> bool:
+        return self.db.execute("SELECT 1 FROM weeks WHERE league_id=? AND season=? AND week=?",
+                               (self.league_id, self.season, week)).fetchone() is not None
+
+    def ingest_week(self, week: int, rows: list):
+        """Persist a completed week's rows. Final weeks are immutable, so re-ingesting is a no-op."""
+        if self.has_week(week):
+            return
+        with self.db:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO team_week (league_id, season, {', '.join(_COLUMNS)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(_COLUMNS))})",
+                [(self.league_id, self.season, *(r.get(c) for c in _COLUMNS)) for r in rows],
+            )
+            self.db.execute("INSERT INTO weeks (league_id, season, week, ingested_at) VALUES (?, ?, ?, ?)",
+                            (self.league_id, self.season, week, time.time()))
+
+    def rows(self, week: int | None = None) -> list:
+        q = "SELECT * FROM team_week WHERE league_id=? AND season=?"
+        args = [self.league_id, self.season]
+        if week is not None:
+            q += " AND week=?"
+            args.append(week)
+        return [dict(r) for r in self.db.execute(q + " ORDER BY week, team_id", args)]
+
+    def totals(self) -> dict:
+        """{team_id: {"points_for", "wins", "losses", "ties"}} over every stored week."""
+        cur = self.db.execute(
+            "SELECT team_id, SUM(score) AS points_for, "
+            "SUM(result='W') AS wins, SUM(result='L') AS losses, SUM(result='T') AS ties "
+            "FROM team_week WHERE league_id=? AND season=? GROUP BY team_id",
+            (self.league_id, self.season))
+        return {r["team_id"]: dict(r) for r in cur}
+
+    def lineup_gaps(self) -> dict:
+        """{team_id: season points lost to lineup choices, SUM(optimal_lineup - actual_lineup)} over solved weeks."""
+        cur = self.db.execute(
+            "SELECT team_id, SUM(optimal_lineup - actual_lineup) AS gap FROM team_week "
+            "WHERE league_id=? AND season=? AND optimal_lineup IS NOT NULL AND actual_lineup IS NOT NULL "
+            "GROUP BY team_id", (self.league_id, self.season))
+        return {r["team_id"]: r["gap"] for r in cur}
+
+def _sum_proj_from_entry_list(entry_list, week):
+    """Return (found_any, sum) of starter projections from parsed RosterEntry objects if stats are attached."""
+    total = 0.0
+    found_any = False
+    starters = 0
+    for e in entry_list:
+        if not e.starter:
+            continue
+        starters += 1
+        proj = e.stat(week, PROJECTION)
+        if proj is not None:
+            total += proj
+            found_any = True
+    if not found_any:
+        event("projection.missing", week=week, starters=starters)
+    return found_any, total
+
+def roster_projections(week: int, team_ids=None) -> dict:
+    """Fetch mRoster once for the week and return {team_id: starter projection sum} for every team (or just `team_ids`)."""
+    doc = get_views(["mRoster"], **league_query(scoring_period=week, team_ids=team_ids))
+    with span("projections", week=week) as info:
+        rosters = parse_roster(doc)
+        if team_ids is not None:
+            rosters = {tid: entries for tid, entries in rosters.items() if tid in team_ids}
+        index = {tid: _sum_proj_from_entry_list(entries, week)[1] for tid, entries in rosters.items() if entries}
+        info["teams"] = len(index)
+    return index
+
+def projected_points_for_team(team_id: int, week: int, index: dict | None = None) -> float:
+    """Sum projected points for that team's starters for the given week via mRoster."""
+    if index is None:
+        index = roster_projections(week, [team_id])
+    if team_id not in index:
+        event("projection.missing", week=week, team_id=team_id, reason="not in mRoster")
+        return 0.0
+    return index[team_id]
+
+def collect_entries_points(side, week):
+    """Returns (num_starters, actual_points, all_points_list) for best/worst manager calc."""
+    pts_all = [e.points(week) for e in side.entries if e.starter]
+    return len(pts_all), sum(pts_all), pts_all
+
+def week_rows(matchups, week: int, slot_counts: dict, players: list | None = None) -> list:
+    """
+    One row per team for the week's parsed matchups: score, projection, lineup efficiency, result.
+    Per-player rows for player_store are appended to `players` when given.
+    """
+    if players is not None:
+        from player_store import player_records  # NumPy only when per-player rows are wanted
+    rows = []
+    roster_index = None  # mRoster is fetched at most once, and only if a projection is missing
+    lineups = []  # (row, entries) solved together below
+    for m in matchups:
+        for side, opp in ((m.home, m.away), (m.away, m.home)):
+            if side is None:
+                continue
+            proj = side.proj
+            if proj == 0:  # Fallback to roster-based projections when zeros
+                if roster_index is None:
+                    roster_index = roster_projections(week)
+                proj = projected_points_for_team(side.team_id, week, roster_index)
+            row = {"week": week, "team_id": side.team_id, "score": side.score, "proj": proj,
+                   "opponent_id": None, "opp_score": None, "result": None,
+                   "actual_lineup": None, "optimal_lineup": None, "final": m.winner not in (None, "UNDECIDED")}
+            if opp is not None:
+                row["opponent_id"], row["opp_score"] = opp.team_id, opp.score
+                if m.winner in ("HOME", "AWAY", "TIE"):
+                    won = m.winner == ("HOME" if side is m.home else "AWAY")
+                    row["result"] = "T" if m.winner == "TIE" else "W" if won else "L"
+                else:
+                    row["result"] = "W" if side.score > opp.score else "L" if side.score < opp.score else "T"
+            if players is not None:
+                players.extend(player_records(side.team_id, week, side.entries))
+            if side.entries and slot_counts:
+                row["actual_lineup"] = collect_entries_points(side, week)[1]
+                lineups.append((row, side.entries))
+            rows.append(row)
+    with span("lineups", week=week, teams=len(lineups)):
+        for row, entries in lineups:
+            row["optimal_lineup"] = optimal_lineup(entries, slot_counts, week)[0]
+    return rows
+
+def fetch_week(week: int, slot_counts: dict, players: list | None = None) -> list:
+    """Stream one matchup period with its rosters attached and turn it into store rows (see week_rows)."""
+    matchups = get_stream(["mMatchup", "mMatchupScore"], SCHEDULE,
+                          where=lambda m: m.get("matchupPeriodId") == week,
+                          **league_query(matchup_periods=[week], scoring_period=week))
+    return week_rows((Matchup(m) for m in matchups), week, slot_counts, players)
+
+def upcoming_schedule(doc: dict) -> list:
+    """Raw mMatchup schedule from the current period through the end of the regular season, filtered server-side."""
+    current = doc["status"]["currentMatchupPeriod"]
+    last = ((doc.get("settings") or {}).get("scheduleSettings") or {}).get("matchupPeriodCount") or current
+    mm = get_views(["mMatchup"], **league_query(matchup_periods=range(current, max(current, last) + 1)))
+    return mm.get("schedule") or []
+
+def sync(store: SeasonStore, current_period: int, slot_counts: dict, weeks=None, players=None) -> dict:
+    """
+    Make sure `weeks` (default: every completed period) are available; returns {week: rows}.
+    Only periods the store (or the optional PlayerStore `players`) lacks are fetched, and a period
+    is persisted only once ESPN has decided every matchup in it (`winner` set), since stored weeks
+    are never refetched and stat corrections land before then.
+    """
+    weeks = list(range(1, current_period)) if weeks is None else list(weeks)
+    have = set(store.weeks())
+    have_players = set(players.weeks()) if players is not None else None
+    out = {}
+    for w in weeks:
+        if w in have and (have_players is None or w in have_players):
+            out[w] = store.rows(w)
+            continue
+        player_rows = [] if players is not None else None
+        rows = fetch_week(w, slot_counts, player_rows)
+        if w < current_period and rows and all(r["final"] for r in rows if r["opponent_id"] is not None):
+            store.ingest_week(w, rows)
+            if players is not None:
+                players.ingest_week(w, player_rows)
+        out[w] = store.rows(w) if w in have else rows
+    return out
@@ -0,0 +1,151 @@
+"""
+Lightweight spans for the hot paths: every ESPN fetch (views, params, host, status, bytes,
+latency, retries, cache hit/miss) and each computation phase (parse, projections, lineups,
+odds, render) plus whole jobs. Spans are kept in memory; at exit a JSON summary is written to
+JLBOT_TELEMETRY (default .jlbot/telemetry.json, empty to disable) and, when JLBOT_PROM_FILE is
+set, a Prometheus textfile for node_exporter's textfile collector.
+"""
+import os, sys, json, time, atexit, threading, functools, contextlib
+
+TELEMETRY_FILE = os.environ.get("JLBOT_TELEMETRY", os.path.join(".jlbot", "telemetry.json"))
+PROM_FILE = os.environ.get("JLBOT_PROM_FILE", "")
+
+_spans = []
+_lock = threading.Lock()
+_started = time.time()
+
+def _league():
+    # The runner's league name (default, L2, ...), never LEAGUE_ID: spans end up in a public
+    # artifact. Resolved lazily, since espn_http itself records spans.
+    try:
+        from espn_http import env
+        return env("LEAGUE_NAME")
+    except ImportError:
+        return None
+
+@contextlib.contextmanager
+def span(name: str, **attrs):
+    """Time a block. Yields the span's attribute dict so the block can add results (status, bytes, ...)."""
+    attrs.setdefault("league", _league())
+    t0 = time.perf_counter()
+    start = time.time()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        rec = {"name": name, "start": start, "ms": round((time.perf_counter() - t0) * 1000, 3),
+               "thread": threading.current_thread().name, **attrs}
+        with _lock:
+            _spans.append(rec)
+
+def event(name: str, **attrs):
+    """A zero-duration span, for things worth counting (e.g. a team missing from mRoster)."""
+    with span(name, **attrs):
+        pass
+
+def traced(name: str, **attrs):
+    """Decorator form of span()."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*a, **kw):
+            with span(name, **attrs):
+                return fn(*a, **kw)
+        return inner
+    return wrap
+
+def spans() -> list:
+    with _lock:
+        return list(_spans)
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def summary() -> dict:
+    """Per-span-name counts and latency percentiles, plus fetch totals by view and by base."""
+    recs = spans()
+    by_name, fetch_views, fetch_bases = {}, {}, {}
+    for r in recs:
+        by_name.setdefault(r["name"], []).append(r)
+    phases = {name: {"count": len(rs), "total_ms": round(sum(r["ms"] for r in rs), 3),
+                     "p50_ms": _pct([r["ms"] for r in rs], 0.5), "p95_ms": _pct([r["ms"] for r in rs], 0.95),
+                     "max_ms": max(r["ms"] for r in rs), "errors": sum(1 for r in rs if "error" in r)}
+              for name, rs in by_name.items()}
+    fetches = by_name.get("fetch", [])
+    for r in fetches:
+        v = fetch_views.setdefault(r.get("views", "?"), {"count": 0, "bytes": 0, "ms": 0.0, "cache_hits": 0})
+        v["count"] += 1
+        v["bytes"] += r.get("bytes") or 0
+        v["ms"] = round(v["ms"] + r["ms"], 3)
+        v["cache_hits"] += r.get("cache") == "hit"
+        if r.get("base"):
+            b = fetch_bases.setdefault(r["base"], {"count": 0, "retries": 0, "latencies_ms": []})
+            b["count"] += 1
+            b["retries"] += r.get("retries") or 0
+            b["latencies_ms"].append(r["ms"])
+    for b in fetch_bases.values():
+        lat = b.pop("latencies_ms")
+        b.update(p50_ms=_pct(lat, 0.5), p95_ms=_pct(lat, 0.95))
+    return {
+        "started": _started, "wall_s": round(time.time() - _started, 3), "argv": sys.argv,
+        "phases": phases,
+        "fetch": {"count": len(fetches), "bytes": sum(r.get("bytes") or 0 for r in fetches),
+                  "cache_hits": sum(1 for r in fetches if r.get("cache") == "hit"),
+                  "cache_misses": sum(1 for r in fetches if r.get("cache") == "miss"),
+                  "retries": sum(r.get("retries") or 0 for r in fetches),
+                  "by_view": fetch_views, "by_base": fetch_bases},
+        "spans": recs,
+    }
+
+def prometheus(s: dict) -> str:
+    """Textfile-collector exposition of a summary()."""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"')
+    out = ["# TYPE jlbot_phase_seconds_total counter", "# TYPE jlbot_phase_count counter"]
+    for name, p in s["phases"].items():
+        out.append(f'jlbot_phase_seconds_total{{phase="{esc(name)}"}} {p["total_ms"] / 1000:.6f}')
+        out.append(f'jlbot_phase_count{{phase="{esc(name)}"}} {p["count"]}')
+    f = s["fetch"]
+    out += ["# TYPE jlbot_espn_fetch_bytes_total counter", f"jlbot_espn_fetch_bytes_total {f['bytes']}",
+            "# TYPE jlbot_espn_cache_hits_total counter", f"jlbot_espn_cache_hits_total {f['cache_hits']}",
+            "# TYPE jlbot_espn_cache_misses_total counter", f"jlbot_espn_cache_misses_total {f['cache_misses']}",
+            "# TYPE jlbot_espn_retries_total counter", f"jlbot_espn_retries_total {f['retries']}",
+            "# TYPE jlbot_espn_latency_seconds gauge"]
+    for base, b in f["by_base"].items():
+        for q, key in (("0.5", "p50_ms"), ("0.95", "p95_ms")):
+            out.append(f'jlbot_espn_latency_seconds{{base="{esc(base)}",quantile="{q}"}} {b[key] / 1000:.6f}')
+    out += ["# TYPE jlbot_run_wall_seconds gauge", f"jlbot_run_wall_seconds {s['wall_s']}",
+            "# TYPE jlbot_run_timestamp_seconds gauge", f"jlbot_run_timestamp_seconds {s['started']:.0f}"]
+    return "\n".join(out) + "\n"
+
+def _atomic_write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def write(path: str | None = None, prom_path: str | None = None):
+    """Write the JSON summary (and the Prometheus textfile, if configured); prints a one-line digest."""
+    path = TELEMETRY_FILE if path is None else path
+    prom_path = PROM_FILE if prom_path is None else prom_path
+    s = summary()
+    try:
+        if path:
+            _atomic_write(path, json.dumps(s, indent=2, default=str))
+        if prom_path:
+            _atomic_write(prom_path, prometheus(s))
+    except OSError as e:
+        print(f"[telemetry] write failed: {e}", file=sys.stderr)
+        return s
+    top = sorted(s["phases"].items(), key=lambda kv: -kv[1]["total_ms"])[:6]
+    print(f"[telemetry] {s['wall_s']:.2f}s, {s['fetch']['count']} fetches ({s['fetch']['cache_hits']} cached, "
+          f"{s['fetch']['bytes'] / 1024:.0f} KiB): " + ", ".join(f"{n} {p['total_ms']:.0f}ms" for n, p in top),
+          file=sys.stderr)
+    return s
+
+@atexit.register
+def _at_exit():
+    if _spans and (TELEMETRY_FILE or PROM_FILE):
+        write()
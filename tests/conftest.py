@@ -0,0 +1,6 @@
+import os, sys
+
+# The bot is a set of top-level modules, not a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# No telemetry file or exit summary from test runs; set before telemetry.py reads it
+os.environ["JLBOT_TELEMETRY"] = ""
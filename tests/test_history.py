@@ -0,0 +1,42 @@
+import json
+from history import PLAYOFF, CONSOLATION, REGULAR, HistoryArchive, normalize
+
+name_for = lambda tid: f"T{tid}"
+
+def season(year, records, games, champion):
+    teams = {str(t): {"name": f"T{t}", "abbrev": f"T{t}", "owner": None, "wins": w, "losses": l, "ties": ties,
+                      "points_for": pf, "final_rank": 1 if t == champion else 2}
+             for t, (w, l, ties, pf) in records.items()}
+    return {"season": year, "name": "League", "periods": 2, "teams": teams, "games": games}
+
+def archive(tmp_path):
+    seasons = [season(2023, {1: (2, 0, 0, 220.0), 2: (0, 2, 0, 180.0)},
+                      [[1, 1, 2, 110.0, 90.0, REGULAR], [2, 2, 1, 90.0, 110.0, REGULAR], [3, 1, 2, 100.0, 99.0, PLAYOFF]], 1),
+               season(2024, {1: (0, 1, 1, 190.0), 2: (1, 0, 1, 200.0), 3: (1, 1, 0, 150.0)},
+                      [[1, 1, 2, 95.0, 95.0, REGULAR], [2, 2, 1, 105.0, 95.0, REGULAR], [3, 1, 2, 150.0, 80.0, CONSOLATION]], 2)]
+    for s in seasons:
+        (tmp_path / f"{s['season']}.json").write_text(json.dumps(s))
+    return HistoryArchive(path=str(tmp_path))
+
+def test_franchise_sums_archived_seasons(tmp_path):
+    h = archive(tmp_path)
+    f = h.franchise(1)
+    assert (f["wins"], f["losses"], f["ties"], f["points_for"], f["titles"]) == (2, 1, 1, 410.0, [2023])
+    assert h.franchise_line(1, name_for) == "**T1** — 2–1–1 over 2 seasons • 🏆 2023"
+    assert h.franchise_line(3, name_for) == "**T3** — 1–1 over 1 season"
+    assert h.franchise_line(4, name_for) is None
+
+def test_rivalry_includes_the_current_season_but_not_consolation(tmp_path):
+    h = archive(tmp_path)
+    # Regular season and playoffs only: T1 won 3 (incl. the 2023 final), T2 won 1, one tie
+    assert h.rivalry_line(1, 2, name_for) == "All-time: T1 leads 3–1–1 (last: 2024 wk 2, T2)"
+    h.add_season(2025, [{"week": 1, "team_id": 1, "opponent_id": 2, "score": 80.0, "opp_score": 120.0},
+                        {"week": 1, "team_id": 2, "opponent_id": 1, "score": 120.0, "opp_score": 80.0}], periods=2)
+    assert h.rivalry_line(1, 2, name_for) == "All-time: T1 leads 3–2–1 (last: 2025 wk 1, T2)"
+    assert h.high_scores(1) == [(120.0, 2025, 1, 2)]
+
+def test_normalize_skips_unfinished_seasons():
+    doc = {"seasonId": 2025, "settings": {"scheduleSettings": {"matchupPeriodCount": 2}}, "teams": [],
+           "schedule": [{"id": 1, "matchupPeriodId": 2, "winner": "UNDECIDED",
+                         "home": {"teamId": 1, "totalPoints": 0}, "away": {"teamId": 2, "totalPoints": 0}}]}
+    assert normalize(doc) is None
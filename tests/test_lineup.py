@@ -0,0 +1,53 @@
+import random
+from lineup import optimal_lineup, starter_slot_counts
+from models import BENCH, IR, RosterEntry
+
+QB, RB, WR, TE, FLEX = 0, 2, 4, 6, 23
+SLOTS = {QB: 1, RB: 2, WR: 1, TE: 1, FLEX: 1}
+ELIGIBLE = [[QB], [RB, FLEX], [WR, FLEX], [TE, FLEX], [RB, WR, FLEX], [WR, TE, FLEX]]  # incl. multi-position players
+
+def entry(pid, points, eligible, slot=BENCH):
+    return RosterEntry({"lineupSlotId": slot, "playerPoolEntry": {"appliedStatTotal": points, "player": {
+        "id": pid, "fullName": f"P{pid}", "eligibleSlots": eligible + [BENCH, IR]}}})
+
+def brute_force(entries, slot_counts):
+    slots = [s for s, n in sorted(slot_counts.items()) for _ in range(n)]
+    def best(i, used):
+        if i == len(slots):
+            return 0.0
+        top = best(i + 1, used)  # leave the slot empty
+        for j, e in enumerate(entries):
+            if j not in used and slots[i] in e.eligible_slots:
+                top = max(top, e.points() + best(i + 1, used | {j}))
+        return top
+    return best(0, frozenset())
+
+def test_matches_brute_force_on_random_rosters():
+    r = random.Random(3)
+    for trial in range(150):
+        entries = [entry(i, round(r.uniform(-4, 25), 1), list(r.choice(ELIGIBLE))) for i in range(r.randint(1, 9))]
+        total, lineup = optimal_lineup(entries, SLOTS)
+        assert abs(total - brute_force(entries, SLOTS)) < 1e-9, trial
+        # Every player placed at most once, in a slot they can play, within the slot counts
+        assert len({id(e) for e, _ in lineup}) == len(lineup)
+        assert all(s in e.eligible_slots for e, s in lineup)
+        assert all(sum(s == k for _, s in lineup) <= n for k, n in SLOTS.items())
+        assert abs(sum(e.points() for e, _ in lineup) - total) < 1e-9
+
+def test_flex_takes_the_best_leftover_and_negatives_stay_benched():
+    entries = [entry(1, 20.0, [QB]), entry(2, 15.0, [RB, FLEX]), entry(3, 14.0, [RB, FLEX]),
+               entry(4, 12.0, [RB, FLEX]), entry(5, 9.0, [WR, FLEX]), entry(6, -2.0, [TE, FLEX])]
+    total, lineup = optimal_lineup(entries, SLOTS)
+    slots = {e.player_id: s for e, s in lineup}
+    assert total == 70.0
+    assert slots == {1: QB, 2: RB, 3: RB, 4: FLEX, 5: WR}  # the negative TE is better left out
+
+def test_multi_eligible_player_moves_to_free_a_slot():
+    # Player 2 can play RB or WR; the only other WR is worse than the second RB, so 2 must go to WR
+    entries = [entry(1, 10.0, [RB]), entry(2, 9.0, [RB, WR]), entry(3, 8.0, [RB]), entry(4, 1.0, [WR])]
+    total, lineup = optimal_lineup(entries, {RB: 2, WR: 1})
+    assert total == 27.0 and {e.player_id: s for e, s in lineup} == {1: RB, 3: RB, 2: WR}
+
+def test_starter_slot_counts_drops_bench_ir_and_empty():
+    doc = {"settings": {"rosterSettings": {"lineupSlotCounts": {"0": 1, "2": 2, "20": 7, "21": 1, "17": 0}}}}
+    assert starter_slot_counts(doc) == {0: 1, 2: 2}
@@ -0,0 +1,60 @@
+import os, json
+import live
+
+REPLAY = os.path.join(os.path.dirname(__file__), "live_replay.jsonl")
+T0 = 1760893200  # the fixture's early kickoff
+H = 3600
+
+def replay_events(capsys):
+    total = live.run(replay=REPLAY, dry_run=True)
+    out = capsys.readouterr().out
+    embeds = json.loads("[" + out[:out.rindex("[live]")].replace("}\n{", "},{") + "]")
+    return total, [e["description"].split("\n") for e in embeds]
+
+def test_replay_posts_each_event_once(capsys):
+    total, posts = replay_events(capsys)
+    assert posts == [
+        ["🔀 **Underdogs** takes the lead over **Favorites**, 22.0–16.0",
+         "⚠️ Upset watch: underdog **Underdogs** is now projected to beat **Favorites** 44.0–40.0"],
+        # Cy Bench keeps outscoring Bo Flex on later polls, but is only announced once
+        ["🪑 **Favorites** has Cy Bench (20.0) on the bench, outscoring starter Bo Flex (8.0)"],
+        # The Monday-night matchup is never final, so only matchup 1 finishes
+        ["🏁 Final: **Underdogs** beats **Favorites** 39.0–22.0 — upset!"],
+    ]
+    assert total == 4
+
+def snap(home, away, pro_teams=(1, 2), final=False):
+    players = lambda: [{"id": t, "name": f"P{t}", "slot": 0, "starter": True, "points": 0.0, "proj": 10.0,
+                        "eligible": [0], "pro_team": t} for t in pro_teams]
+    return {"1": {"winner": "UNDECIDED", "final": final,
+                  "home": {"team": 1, "score": home, "proj": 10.0, "players": players()},
+                  "away": {"team": 2, "score": away, "proj": 10.0, "players": players()}}}
+
+def test_settle_finals_once_every_starter_game_is_over():
+    games = {1: (T0, False), 2: (T0 + 3 * H, False)}
+    assert not live.settle(snap(5, 4), games, T0 + 5 * H)["1"]["final"]
+    assert live.settle(snap(5, 4), games, T0 + 7 * H)["1"]["final"]
+    assert live.settle(snap(5, 4), {1: (T0, True), 2: (T0 + 3 * H, True)}, T0 + H)["1"]["final"]
+    assert not live.settle(snap(5, 4), None, T0 + 99 * H)["1"]["final"]
+
+def test_close_waits_for_games_to_end():
+    games = {1: (T0, False), 2: (T0 + 3 * H, False), 3: (T0 + 3 * H, False)}
+    # 0–0 at kickoff is close on the scoreboard but nowhere near decided
+    assert not live._close(snap(0, 0, (1, 2, 3)), games, T0)
+    # Starters still waiting on a later kickoff are not crunch time either
+    assert not live._close(snap(20, 18, (1, 2, 3)), games, T0 + 2 * H)
+    # Every remaining game in its last stretch
+    assert live._close(snap(20, 18, (1, 2, 3)), games, T0 + 6.5 * H)
+    # Few starters left, already playing
+    assert live._close(snap(20, 18, (1, 2)), games, T0 + 4.5 * H)
+    # Not close, or already final
+    assert not live._close(snap(40, 18, (1, 2)), games, T0 + 6.5 * H)
+    assert not live._close(snap(20, 18, (1, 2), final=True), games, T0 + 6.5 * H)
+    # Without a pro schedule the margin alone decides
+    assert live._close(snap(0, 0), None, T0)
+
+def test_next_interval():
+    assert live.next_interval(live.MAX_INTERVAL, True, True) == live.FAST_INTERVAL
+    assert live.next_interval(live.MAX_INTERVAL, True, False) == live.BASE_INTERVAL
+    assert live.next_interval(live.BASE_INTERVAL, False, True) == live.BASE_INTERVAL * live.BACKOFF
+    assert live.next_interval(live.MAX_INTERVAL, False, False) == live.MAX_INTERVAL
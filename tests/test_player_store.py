@@ -0,0 +1,61 @@
+import random
+from models import BENCH, IR
+from player_store import PlayerStore, eligible_mask
+from season_store import SeasonStore
+
+SLOTS = (0, 2, 4, 6, 23)  # QB, RB, WR, TE, FLEX
+POSITIONS = {0: [0], 2: [2, 23], 4: [4, 23], 6: [6, 23]}
+
+def roster(team, week, r):
+    """One team-week of player rows: a starter per slot, a few bench players and sometimes an IR stash."""
+    rows, pid = [], team * 1000 + week * 20
+    for i, slot in enumerate(SLOTS + (BENCH,) * 4 + (IR,) * r.randint(0, 1)):
+        pos = 2 if slot == 23 else slot if slot in POSITIONS else r.choice(list(POSITIONS))
+        rows.append({"team": team, "week": week, "player": pid + i, "slot": slot,
+                     "points": round(r.uniform(-3, 30), 1), "proj": 10.0,
+                     "eligible": eligible_mask(POSITIONS[pos] + [BENCH, IR]), "acquisition": 0, "name": f"P{pid + i}"})
+    return rows
+
+def brute_force(rows):
+    best = None
+    for b in rows:
+        for s in rows:
+            if (b["team"], b["week"]) != (s["team"], s["week"]) or b["slot"] != BENCH or s["slot"] in (BENCH, IR):
+                continue
+            if b["eligible"] >> s["slot"] & 1 and b["points"] > s["points"]:
+                gap = b["points"] - s["points"]
+                if best is None or gap > best[0]:
+                    best = (gap, s["week"], s["team"], b["player"], s["player"])
+    return best
+
+def test_worst_start_sit_matches_brute_force(tmp_path):
+    r = random.Random(7)
+    store, rows = PlayerStore(path=str(tmp_path / "players")), []
+    for week in range(1, 6):
+        week_rows = [row for team in range(1, 9) for row in roster(team, week, r)]
+        store.ingest_week(week, week_rows)
+        rows += week_rows
+    gap, week, team, benched, started = brute_force(rows)
+    (w, t, b, bpts, s, spts), = store.worst_start_sit(1)
+    assert (w, t, b, s) == (week, team, benched, started)
+    assert abs((bpts - spts) - gap) < 1e-4
+
+    # Survives a reload from the memory-mapped columns
+    assert PlayerStore(path=store.path).worst_start_sit(1) == store.worst_start_sit(1)
+
+def test_worst_start_sit_ignores_ineligible_and_ir(tmp_path):
+    store = PlayerStore(path=str(tmp_path / "players"))
+    row = lambda pid, slot, pts, elig: {"team": 1, "week": 1, "player": pid, "slot": slot, "points": pts, "proj": 0.0,
+                                        "eligible": eligible_mask(elig), "acquisition": 0, "name": f"P{pid}"}
+    store.ingest_week(1, [row(1, 0, 5.0, [0]),            # QB starter
+                          row(2, BENCH, 40.0, [2, 23]),   # RB can't play QB
+                          row(3, IR, 50.0, [0])])         # IR is not the bench
+    assert store.worst_start_sit(1) == []
+
+def test_lineup_gaps_sum_optimal_minus_actual(tmp_path):
+    with SeasonStore(path=str(tmp_path / "season.sqlite"), league_id=1, season=2025) as store:
+        row = lambda week, team, actual, optimal: {"week": week, "team_id": team, "score": actual, "proj": 0.0,
+                                                   "actual_lineup": actual, "optimal_lineup": optimal}
+        store.ingest_week(1, [row(1, 1, 100.0, 110.0), row(1, 2, 90.0, 90.0)])
+        store.ingest_week(2, [row(2, 1, 80.0, 85.5), row(2, 2, 70.0, None)])
+        assert store.lineup_gaps() == {1: 15.5, 2: 0.0}
@@ -0,0 +1,45 @@
+import numpy as np
+import playoff_odds
+
+def doc(current=3, periods=3, playoff=2):
+    # Teams 1-4; the schedule holds only the current period onward, like upcoming_schedule()
+    sched = [{"matchupPeriodId": p, "home": {"teamId": h}, "away": {"teamId": a}}
+             for p in range(current, periods + 1) for h, a in ((1, 2), (3, 4))]
+    return {"status": {"currentMatchupPeriod": current}, "schedule": sched,
+            "settings": {"scheduleSettings": {"matchupPeriodCount": periods, "playoffTeamCount": playoff}}}
+
+def rows(week, scores, decided=True):
+    out = []
+    for (a, b) in ((1, 2), (3, 4)):
+        for t, o in ((a, b), (b, a)):
+            res = "W" if scores[t] > scores[o] else "L" if scores[t] < scores[o] else "T"
+            out.append({"week": week, "team_id": t, "opponent_id": o, "score": scores[t], "opp_score": scores[o],
+                        "result": res, "final": decided})
+    return out
+
+def test_undecided_past_week_counts_at_actual_scores(monkeypatch):
+    seen = {}
+    def fake_simulate(mu, sigma, games, periods, wins0, pf0, playoff, byes, **kw):
+        seen.update(games=games, wins0=wins0, pf0=pf0)
+        return np.zeros((len(mu), 3))
+    monkeypatch.setattr(playoff_odds, "simulate", fake_simulate)
+    synced = {1: rows(1, {1: 100, 2: 90, 3: 80, 4: 70}),
+              # Finished, but ESPN hasn't set the winners yet, so sync() didn't store it
+              2: rows(2, {1: 110, 2: 95, 3: 60, 4: 85}, decided=False)}
+    assert playoff_odds.league_odds(doc(), synced) is not None
+    assert seen["wins0"].tolist() == [2, 0, 1, 1]
+    assert seen["pf0"].tolist() == [210, 185, 140, 155]
+    # Only week 3 is simulated
+    assert len(seen["games"]) == 2 and set(seen["games"][:, 2]) == {0}
+
+def test_odds_are_reproducible_and_sum_to_playoff_spots():
+    synced = {w: rows(w, {1: 100 + w, 2: 90, 3: 95 - w, 4: 70}) for w in (1, 2)}
+    a = playoff_odds.league_odds(doc(), synced, sims=4000, seed=1)
+    assert a == playoff_odds.league_odds(doc(), synced, sims=4000, seed=1)
+    assert abs(sum(o["playoffs"] for o in a.values()) - 2) < 1e-9
+    assert abs(sum(o["last"] for o in a.values()) - 1) < 1e-9
+    assert a[1]["playoffs"] == 1.0 and a[4]["playoffs"] == 0.0
+
+def test_nothing_left_to_simulate():
+    synced = {w: rows(w, {1: 100, 2: 90, 3: 80, 4: 70}) for w in (1, 2, 3)}
+    assert playoff_odds.league_odds(doc(current=4), synced) is None
@@ -0,0 +1,49 @@
+import random
+import numpy as np
+import pytest
+from power_engine import parse_weights, ranking_order, score_matrix, season_metrics
+
+nan = np.nan
+# 4 teams, 2 weeks. Week 1: 0 beats 3, 1 and 2 tie at 90. Week 2: 2 beats 0, 1 scores on a bye, 3 is missing.
+SCORES = np.array([[100, 70], [90, 110], [90, 80], [60, nan]], dtype=float)
+RESULTS = np.array([[1, 0], [0.5, nan], [0.5, 1], [0, nan]], dtype=float)
+
+def test_all_play_luck_and_median_by_hand():
+    m = season_metrics(SCORES, RESULTS)
+    assert m["allplay_w"][:, 1].tolist() == [3, 3, 2, 0]
+    assert m["allplay_l"][:, 1].tolist() == [2, 1, 2, 3]
+    assert m["allplay_t"][:, 1].tolist() == [0, 1, 1, 0]
+    assert m["allplay"][:, 1] == pytest.approx([3 / 5, 3.5 / 5, 2.5 / 5, 0])
+    # Expected wins: week 1 over 3 opponents, week 2 over 2
+    assert m["expected"][:, 1] == pytest.approx([1, 0.5 + 1, 0.5 + 0.5, 0])
+    # Luck only counts weeks with a result, so team 1's bye week doesn't count against them
+    assert m["luck"][:, 1] == pytest.approx([0, 0, 0.5, 0])
+    # Medians 90 then 80; a score equal to the median is half a win
+    assert m["median"][:, 1] == pytest.approx([0.5, 0.75, 0.5, 0])
+    assert m["pf"][:, 1].tolist() == [170, 200, 170, 60]
+    assert m["wins"][:, 1].tolist() == [1, 0.5, 1.5, 0]
+
+def test_all_play_matches_pairwise_loop():
+    r = random.Random(11)
+    rows = [{"team_id": t, "week": w, "score": round(r.uniform(60, 140)), "result": r.choice("WLT")}
+            for t in range(1, 11) for w in range(1, 9) if r.random() > 0.1]
+    team_ids, weeks, scores, results = score_matrix(rows)
+    m = season_metrics(scores, results)
+    for i in range(len(team_ids)):
+        w = l = t = 0
+        for j in range(len(weeks)):
+            if np.isnan(scores[i, j]):
+                continue
+            others = [scores[k, j] for k in range(len(team_ids)) if k != i and not np.isnan(scores[k, j])]
+            w += sum(scores[i, j] > o for o in others)
+            l += sum(scores[i, j] < o for o in others)
+            t += sum(scores[i, j] == o for o in others)
+        assert (m["allplay_w"][i, -1], m["allplay_l"][i, -1], m["allplay_t"][i, -1]) == (w, l, t)
+
+def test_ranking_order_and_weights():
+    m = season_metrics(SCORES, RESULTS)
+    assert ranking_order(m, {"pf": 1.0})[:, 1].tolist() == [1, 0, 2, 3]
+    assert parse_weights("pf=0.5, allplay") == {"pf": 0.5, "allplay": 1.0}
+    assert parse_weights("") == {"pf": 1.0}
+    with pytest.raises(ValueError):
+        parse_weights("vibes=1")
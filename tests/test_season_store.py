@@ -0,0 +1,48 @@
+import season_store
+from models import Matchup
+from season_store import SeasonStore, sync, week_rows
+
+def matchup(mid, week, home, away, winner):
+    side = lambda t, pts: {"teamId": t, "totalPoints": pts, "totalProjectedPoints": 100.0}
+    return Matchup({"id": mid, "matchupPeriodId": week, "winner": winner,
+                    "home": side(*home), "away": side(*away) if away else None})
+
+def test_week_rows_take_results_from_espn_winner():
+    rows = {r["team_id"]: r for r in week_rows([
+        matchup(1, 1, (1, 99.0), (2, 100.0), "HOME"),       # a stat correction ESPN already applied
+        matchup(2, 1, (3, 80.0), (4, 70.0), "UNDECIDED"),
+        matchup(3, 1, (5, 60.0), None, "UNDECIDED")], 1, {})}
+    assert (rows[1]["result"], rows[2]["result"]) == ("W", "L")
+    assert rows[1]["final"] and not rows[3]["final"]
+    assert rows[3]["result"] == "W"  # provisional, from the scores
+    assert rows[5]["opponent_id"] is None and rows[5]["result"] is None
+
+def test_sync_freezes_only_weeks_whose_matchups_all_have_a_winner(monkeypatch, tmp_path):
+    winners = {1: ["HOME", "AWAY"], 2: ["HOME", "UNDECIDED"], 3: ["UNDECIDED", "UNDECIDED"]}
+    fetched = []
+    def fake_fetch(week, slot_counts, players=None):
+        fetched.append(week)
+        # A bye is never decided, and must not hold its week back
+        return week_rows([matchup(1, week, (1, 100.0 + week), (2, 90.0), winners[week][0]),
+                          matchup(2, week, (3, 80.0), (4, 85.0), winners[week][1]),
+                          matchup(3, week, (5, 70.0), None, "UNDECIDED")], week, slot_counts)
+    monkeypatch.setattr(season_store, "fetch_week", fake_fetch)
+
+    with SeasonStore(path=str(tmp_path / "season.sqlite"), league_id=1, season=2025) as store:
+        out = sync(store, 4, {})
+        assert store.weeks() == [1]
+        assert fetched == [1, 2, 3]
+        # Undecided weeks are still returned, with provisional results
+        assert sorted(out) == [1, 2, 3] and {r["team_id"]: r["result"] for r in out[2]}[3] == "L"
+
+        fetched.clear()
+        winners[2][1] = "AWAY"
+        sync(store, 4, {})
+        assert fetched == [2, 3] and store.weeks() == [1, 2]
+
+        # The current period is never frozen, even once decided
+        fetched.clear()
+        winners[3] = ["HOME", "HOME"]
+        sync(store, 3, {}, weeks=[3])
+        assert fetched == [3] and store.weeks() == [1, 2]
+        assert store.totals()[1]["wins"] == 2
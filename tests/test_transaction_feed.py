@@ -0,0 +1,85 @@
+import copy
+import pytest
+import espn_http, fake_espn, transaction_feed
+from fake_espn import FakeESPN
+from transaction_feed import TransactionFeed, fold
+
+def move(id, date, type="FREEAGENT", team=1, bid=0, status="EXECUTED", items=None, period=1):
+    items = items if items is not None else [{"type": "ADD", "playerId": 1, "fromTeamId": 0, "toTeamId": team},
+                                             {"type": "DROP", "playerId": 2, "fromTeamId": team, "toTeamId": 0}]
+    return {"id": id, "type": type, "status": status, "teamId": team, "bidAmount": bid,
+            "processDate": date, "scoringPeriodId": period, "items": items}
+
+@pytest.fixture(autouse=True)
+def offline_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(espn_http, "CACHE_DIR", "")
+    monkeypatch.setattr(espn_http, "HEALTH_FILE", str(tmp_path / "health.json"))
+
+def test_fold_counts_a_trade_once_per_team():
+    totals = {}
+    fold(totals, move("t", 1, type="TRADE_ACCEPT", items=[
+        {"type": "TRADE", "playerId": 1, "fromTeamId": 1, "toTeamId": 2},
+        {"type": "TRADE", "playerId": 2, "fromTeamId": 1, "toTeamId": 2},
+        {"type": "TRADE", "playerId": 3, "fromTeamId": 2, "toTeamId": 1}]))
+    assert totals == {"1": {"adds": 0, "drops": 0, "trades": 1, "faab": 0},
+                      "2": {"adds": 0, "drops": 0, "trades": 1, "faab": 0}}
+
+def test_fold_counts_faab_on_waivers_only():
+    totals = {}
+    fold(totals, move("a", 1, type="FREEAGENT", bid=10))
+    fold(totals, move("b", 2, type="WAIVER", bid=7))
+    assert totals["1"] == {"adds": 2, "drops": 2, "trades": 0, "faab": 7}
+
+def test_update_skips_seen_ties_and_cancelled(monkeypatch, tmp_path):
+    pages = {1: [move("a", 100), move("b", 200), move("x", 150, status="CANCELED")]}
+    calls = []
+    def fake_get_views(views, params, filters):
+        calls.append(params["scoringPeriodId"])
+        return {"transactions": pages.get(params["scoringPeriodId"], [])}
+    monkeypatch.setattr(transaction_feed, "get_views", fake_get_views)
+    feed = TransactionFeed(path=str(tmp_path / "feed.json"))
+    assert feed.update(1) == 2
+    assert feed.state["cursor"] == {"period": 1, "date": 200, "ids": ["b"]}
+
+    # Same instant as the cursor: only the unseen id counts; older entries are never refolded
+    pages[1].append(move("c", 200, team=2))
+    pages[2] = [move("d", 300, type="WAIVER", bid=5, period=2)]
+    calls.clear()
+    assert feed.update(2) == 2
+    assert calls == [1, 2]
+    assert feed.state["cursor"] == {"period": 2, "date": 300, "ids": ["d"]}
+    assert feed.season == {"1": {"adds": 3, "drops": 3, "trades": 0, "faab": 5},
+                           "2": {"adds": 1, "drops": 1, "trades": 0, "faab": 0}}
+    assert feed.period(1)["1"]["adds"] == 2 and feed.period(2)["1"]["faab"] == 5
+
+    # State survives a reload
+    assert TransactionFeed(path=feed.path).state == feed.state
+
+def test_update_against_fake_espn_is_incremental(tmp_path):
+    srv = FakeESPN(teams=10, week=4, seed=5).start()
+    settings = {"LEAGUE_ID": "1", "SEASON_ID": "2025", "ESPN_S2": "x", "SWID": "{y}", "ESPN_BASE_URL": srv.url}
+    try:
+        with espn_http.use_league(settings):
+            feed = TransactionFeed(path=str(tmp_path / "feed.json"))
+            assert feed.update(4) > 0
+            before = copy.deepcopy(feed.state)
+
+            srv.reset()
+            assert feed.update(4) == 0
+            assert srv.requests == 1  # only the cursor's period is fetched again
+            assert feed.state["season"] == before["season"] and feed.state["periods"] == before["periods"]
+
+            srv.week = 6
+            assert feed.update(6) > 0
+    finally:
+        srv.shutdown()
+
+    # Running totals match a rescan of every executed move
+    full, periods = {}, {}
+    for p in range(1, 7):
+        for t in fake_espn.transactions(10, p, 5):
+            if t["status"] == "EXECUTED":
+                fold(full, t)
+                fold(periods.setdefault(str(p), {}), t)
+    assert feed.season == full
+    assert feed.state["periods"] == periods
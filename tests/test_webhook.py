@@ -0,0 +1,77 @@
+import pytest, requests
+import webhook
+from fake_webhook import FakeWebhook, violations
+
+def big_embed(fields=60, value_len=900, description_len=9000):
+    return {"title": "Power Rankings " + "x" * 300,
+            "description": "\n".join(f"line {i} " + "d" * 80 for i in range(description_len // 88)),
+            "fields": [{"name": f"Field {i}", "value": "\n".join(["v" * 99] * (value_len // 100)), "inline": False}
+                       for i in range(fields)],
+            "footer": {"text": "f" * 3000}}
+
+@pytest.fixture
+def server():
+    srv = FakeWebhook().start()
+    yield srv
+    srv.shutdown()
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(webhook.time, "sleep", slept.append)
+    return slept
+
+def test_split_embed_respects_limits():
+    parts = webhook.split_embed(big_embed())
+    assert len(parts) > 1
+    for p in parts:
+        assert not violations({"embeds": [p]})
+    assert sum(len(p.get("fields") or ()) for p in parts) >= 60
+
+def test_split_embed_chunks_long_field_values():
+    parts = webhook.split_embed({"title": "t", "fields": [{"name": "n", "value": "a" * 3000}]})
+    fields = [f for p in parts for f in p["fields"]]
+    assert "".join(f["value"] for f in fields) == "a" * 3000
+    assert fields[0]["name"] == "n" and all(f["name"] == "\u200b" for f in fields[1:])
+    assert [p["title"] for p in parts] == ["t"] + ["t (cont.)"] * (len(parts) - 1)
+
+def test_pack_groups_within_message_limits():
+    embeds = [big_embed(fields=5, value_len=300, description_len=200) for _ in range(25)]
+    messages = webhook.pack(embeds)
+    assert sum(len(m) for m in messages) == sum(len(webhook.split_embed(e)) for e in embeds)
+    for m in messages:
+        assert not violations({"embeds": m})
+
+def test_post_delivers_every_message(server, sleeps):
+    n = webhook.post([big_embed() for _ in range(3)], url=server.url)
+    assert n == len(server.posts) == server.requests
+    assert all(not violations(p) for p in server.posts)
+
+def test_post_honors_retry_after(server, sleeps):
+    server.rate_limit_every, server.retry_after = 2, 0.25
+    n = webhook.post([big_embed() for _ in range(3)], url=server.url)
+    assert n == len(server.posts)
+    assert server.requests > n
+    assert sleeps.count(0.25) == server.requests - n
+
+def test_post_retries_connection_errors(server, sleeps, monkeypatch):
+    real = webhook.session().post
+    failures = iter([requests.ConnectionError("reset"), requests.Timeout("slow")])
+    def flaky(*a, **kw):
+        e = next(failures, None)
+        if e:
+            raise e
+        return real(*a, **kw)
+    monkeypatch.setattr(webhook.session(), "post", flaky)
+    assert webhook.post([{"title": "t", "description": "d"}], url=server.url) == 1
+    assert len(server.posts) == 1 and len(sleeps) == 2
+
+def test_post_gives_up_after_max_attempts(sleeps, monkeypatch):
+    calls = []
+    def down(*a, **kw):
+        calls.append(1)
+        raise requests.ConnectionError("refused")
+    monkeypatch.setattr(webhook.session(), "post", down)
+    with pytest.raises(requests.ConnectionError):
+        webhook.post([{"title": "t"}], url="http://127.0.0.1:9/webhook")
+    assert len(calls) == webhook.MAX_ATTEMPTS
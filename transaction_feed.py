@@ -0,0 +1,85 @@
+"""
+Incremental transaction feed. ESPN's mTransactions2 view is pulled one scoring period at a
+time, starting at the persisted cursor's period instead of week 1. Moves at or before the
+cursor (last process date, plus the ids seen at that instant) are skipped, and only new
+executed moves are folded into running per-team aggregates (adds, drops, trades, FAAB), kept
+per scoring period and for the season, in .jlbot/transactions/<league>-<season>.json.
+"""
+import os, json
+from espn_http import env, get_views
+from telemetry import span
+
+TXN_DIR = os.environ.get("JLBOT_TXN_DIR", os.path.join(".jlbot", "transactions"))
+VIEW = "mTransactions2"
+TYPES = ["FREEAGENT", "WAIVER", "TRADE_ACCEPT"]  # proposals, lineup moves etc. are never counted
+FIELDS = ("adds", "drops", "trades", "faab")
+
+def _bump(totals: dict, team_id, field: str, n: int = 1):
+    agg = totals.setdefault(str(team_id), dict.fromkeys(FIELDS, 0))
+    agg[field] += n
+
+def fold(totals: dict, t: dict):
+    """Add one executed transaction into {team_id (str): {adds, drops, trades, faab}}."""
+    items = t.get("items") or ()
+    if t.get("type") == "TRADE_ACCEPT":
+        for tid in {i.get(k) for i in items for k in ("fromTeamId", "toTeamId")} - {None, 0, -1}:
+            _bump(totals, tid, "trades")
+        return
+    for i in items:
+        if i.get("type") == "ADD":
+            _bump(totals, i.get("toTeamId") or t.get("teamId"), "adds")
+        elif i.get("type") == "DROP":
+            _bump(totals, i.get("fromTeamId") or t.get("teamId"), "drops")
+    if t.get("type") == "WAIVER" and t.get("bidAmount"):
+        _bump(totals, t.get("teamId"), "faab", int(t["bidAmount"]))
+
+class TransactionFeed:
+    def __init__(self, path=None, league_id=None, season=None):
+        self.path = path or os.path.join(TXN_DIR, f"{league_id or env('LEAGUE_ID')}-{season or env('SEASON_ID')}.json")
+        try:
+            with open(self.path) as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {"cursor": {"period": 1, "date": 0, "ids": []}, "season": {}, "periods": {}}
+
+    @property
+    def season(self) -> dict:
+        return self.state["season"]
+
+    def period(self, scoring_period: int) -> dict:
+        return self.state["periods"].get(str(scoring_period), {})
+
+    def _unseen(self, t: dict) -> bool:
+        c, date = self.state["cursor"], t.get("processDate") or 0
+        return date > c["date"] or (date == c["date"] and t.get("id") not in c["ids"])
+
+    def update(self, current_period: int) -> int:
+        """Fetch the cursor's period through `current_period`, fold in moves newer than the cursor and persist. Returns moves folded."""
+        c = self.state["cursor"]
+        new = []
+        with span("transactions", first=c["period"], last=current_period) as info:
+            for p in range(c["period"], current_period + 1):
+                doc = get_views([VIEW], {"scoringPeriodId": p}, {"transactions": {"filterType": {"value": TYPES}}})
+                new += [dict(t, scoringPeriodId=t.get("scoringPeriodId") or p) for t in doc.get("transactions") or ()
+                        if t.get("status", "EXECUTED") == "EXECUTED" and t.get("processDate") and self._unseen(t)]
+            new.sort(key=lambda t: (t["processDate"], str(t.get("id"))))
+            for t in new:
+                fold(self.state["season"], t)
+                fold(self.state["periods"].setdefault(str(t["scoringPeriodId"]), {}), t)
+            if new:
+                last = new[-1]["processDate"]
+                ids = [t.get("id") for t in new if t["processDate"] == last]
+                c["ids"] = (c["ids"] if last == c["date"] else []) + ids
+                c["date"] = last
+            # The current period can still gain moves, so the next run starts from it again
+            c["period"] = max(c["period"], current_period)
+            info["new"] = len(new)
+        self.save()
+        return len(new)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,135 @@
+"""
+Discord webhook delivery shared by every job. Embeds are split to fit Discord's limits,
+packed up to 10 per message, and posted over the pooled session with 429/5xx handling
+(Retry-After / retry_after, and a pause when X-RateLimit-Remaining hits 0). Connection errors
+and timeouts are retried with the same backoff as ESPN requests, so one dropped connection
+can't cut a multi-message post short.
+"""
+import time, requests
+from espn_http import env, retry_delay, session
+
+USERNAME = "Justice League Bot"
+MAX_EMBEDS = 10        # per message
+MAX_TOTAL = 6000       # characters across all embeds in one message
+MAX_FIELDS = 25
+MAX_TITLE = 256
+MAX_DESCRIPTION = 4096
+MAX_FIELD_NAME = 256
+MAX_FIELD_VALUE = 1024
+MAX_FOOTER = 2048
+MAX_ATTEMPTS = 5
+
+def embed_size(embed: dict) -> int:
+    """Characters Discord counts toward the 6000 limit."""
+    n = len(embed.get("title") or "") + len(embed.get("description") or "")
+    n += len((embed.get("footer") or {}).get("text") or "") + len((embed.get("author") or {}).get("name") or "")
+    for f in embed.get("fields") or ():
+        n += len(f.get("name") or "") + len(f.get("value") or "")
+    return n
+
+def _chunks(text: str, limit: int) -> list:
+    """Split on newlines where possible so no chunk exceeds `limit` characters."""
+    out, cur = [], ""
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if cur:
+                out.append(cur); cur = ""
+            out.append(line[:limit]); line = line[limit:]
+        if cur and len(cur) + 1 + len(line) > limit:
+            out.append(cur); cur = line
+        else:
+            cur = f"{cur}\n{line}" if cur else line
+    if cur or not out:
+        out.append(cur)
+    return out
+
+def split_embed(embed: dict) -> list:
+    """One embed -> as many as needed to respect per-embed field, length and total limits."""
+    base = {k: v for k, v in embed.items() if k not in ("description", "fields")}
+    if base.get("title"):
+        base["title"] = base["title"][:MAX_TITLE]
+    if (base.get("footer") or {}).get("text"):
+        base["footer"] = {**base["footer"], "text": base["footer"]["text"][:MAX_FOOTER]}
+
+    fields = []
+    for f in embed.get("fields") or ():
+        name = (f.get("name") or "\u200b")[:MAX_FIELD_NAME]
+        for i, part in enumerate(_chunks(f.get("value") or "\u200b", MAX_FIELD_VALUE)):
+            fields.append({**f, "name": name if i == 0 else "\u200b", "value": part})
+
+    # Title and footer repeat on every part, so a description chunk gets what's left of the total
+    cont = {**base, "title": f"{base.get('title') or ''} (cont.)"[:MAX_TITLE]}
+    room = min(MAX_DESCRIPTION, MAX_TOTAL - embed_size(cont))
+    descriptions = _chunks(embed["description"], room) if embed.get("description") else []
+    out = []
+    def start(first):
+        e = dict(base)
+        if not first and e.get("title"):
+            e["title"] = f"{e['title']} (cont.)"[:MAX_TITLE]
+        out.append(e)
+        return e
+    cur = start(True)
+    for i, d in enumerate(descriptions):
+        if i:
+            cur = start(False)
+        cur["description"] = d
+    for f in fields:
+        fs = cur.setdefault("fields", [])
+        if len(fs) >= MAX_FIELDS or embed_size(cur) + len(f["name"]) + len(f["value"]) > MAX_TOTAL:
+            cur = start(False)
+            fs = cur.setdefault("fields", [])
+        fs.append(f)
+    return out
+
+def pack(embeds: list) -> list:
+    """Group embeds into messages of at most 10 embeds and 6000 characters."""
+    messages, cur, size = [], [], 0
+    for e in (part for embed in embeds for part in split_embed(embed)):
+        n = embed_size(e)
+        if cur and (len(cur) >= MAX_EMBEDS or size + n > MAX_TOTAL):
+            messages.append(cur); cur, size = [], 0
+        cur.append(e); size += n
+    if cur:
+        messages.append(cur)
+    return messages
+
+def _retry_after(r) -> float:
+    try:
+        return float((r.json() or {}).get("retry_after"))
+    except (ValueError, TypeError, AttributeError):
+        pass
+    try:
+        return float(r.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return 1.0
+
+def _post(url: str, payload: dict):
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            r = session().post(url, json=payload, timeout=20)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(retry_delay(attempt))
+            continue
+        if r.status_code == 429 and attempt < MAX_ATTEMPTS - 1:
+            time.sleep(min(_retry_after(r), 60.0))
+            continue
+        if r.status_code >= 500 and attempt < MAX_ATTEMPTS - 1:
+            time.sleep(retry_delay(attempt, r))
+            continue
+        r.raise_for_status()
+        if r.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                time.sleep(min(float(r.headers.get("X-RateLimit-Reset-After") or 0), 60.0))
+            except ValueError:
+                pass
+        return r
+
+def post(embeds: list, url: str | None = None, username: str = USERNAME) -> int:
+    """Deliver embeds in as few webhook messages as Discord allows. Returns the number of messages sent."""
+    url = url or env("WEBHOOK_URL")
+    messages = pack([e for e in embeds if e])
+    for batch in messages:
+        _post(url, {"username": username, "embeds": batch})
+    return len(messages)
@@ -1,186 +1,59 @@
-import os, requests, datetime, pytz
-from espn_http import get  # must support: get(view, params=dict)
+import datetime
+from zoneinfo import ZoneInfo
+from espn_http import env, get, get_views  # must support: get(view, params=dict)
+from models import parse_teams, team_namer
+from telemetry import span, traced
+from webhook import post
 
-WEBHOOK_URL = os.environ["WEBHOOK_URL"]
-TZ = os.environ.get("TIMEZONE", "America/Denver")
+TZ = "America/Denver"  # default; a league's TIMEZONE setting overrides it
 
 # Turn this False if anything looks off for your league shape
 COMPUTE_OPTIMAL = True
-DEBUG_PROJ = True  # <- turn off later if you want quieter logs
+# Season-long awards: lineup points lost (season store), pickups and start/sit (per-player store)
+SEASON_AWARDS = True
+# A week's high score this high on the all-time list (archived seasons + this one) gets a Record Book field
+RECORD_BOOK_TOP = 5
 
-def send(embed):
-    requests.post(
-        WEBHOOK_URL,
-        json={"username": "Justice League Bot", "embeds": [embed]},
-        timeout=20
-    ).raise_for_status()
-
-def current_week():
-    data = get("mSettings")
+def current_week(doc=None):
+    data = doc or get("mSettings")
     return data["status"]["currentMatchupPeriod"]
 
-def name_map():
-    mt = get("mTeam")
-    teams = mt["teams"]
-    id_to_team = {t["id"]: t for t in teams}
-    def name_for(tid):
-        t = id_to_team.get(tid, {})
-        for a,b in [("location","nickname"), ("teamLocation","teamNickname")]:
-            loc, nick = t.get(a), t.get(b)
-            if loc or nick:
-                return f"{(loc or '').strip()} {(nick or '').strip()}".strip()
-        return t.get("name") or t.get("abbrev") or f"Team {tid}"
-    return id_to_team, name_for
-
-def safe_score(side):
-    for k in ("totalPoints", "appliedTotal", "points"):
-        v = side.get(k)
-        if v is not None:
-            return float(v)
-    return 0.0
-
-def safe_proj(side):
-    for k in ("totalProjectedPointsLive", "totalProjectedPoints", "projectedTotal"):
-        v = side.get(k)
-        if v is not None:
-            return float(v)
-    return 0.0
-
-def _sum_proj_from_entry_list(entry_list, week):
-    """Return (found_any, sum) of starter projections from an entry list if stats are attached."""
-    total = 0.0
-    found_any = False
-    starters = 0
-    for e in entry_list:
-        slot = e.get("lineupSlotId")
-        # EXCLUDE ONLY: Bench(20), IR(21). FLEX(23) **IS a starter** on ESPN.
-        if slot in (20, 21, None):
-            continue
-        starters += 1
-        ppe = e.get("playerPoolEntry") or {}
-        stats = (ppe.get("player", {}) or {}).get("stats", []) or []
-        for s in stats:
-            if (s.get("scoringPeriodId") == week and s.get("statSourceId") == 1 and s.get("statSplitTypeId") == 1):
-                total += float(s.get("appliedTotal") or 0.0)
-                found_any = True
-                break
-    if DEBUG_PROJ:
-        print(f"[proj] entries week={week}: starters={starters} total_proj={total:.2f} found_any={found_any}")
-    return found_any, total
-
-def projected_points_for_team(team_id: int, week: int) -> float:
-    """Sum projected points for that team's starters for the given week via mRoster."""
-    roster = get("mRoster", params={"scoringPeriodId": week})
-    team = next((t for t in roster.get("teams", []) if t.get("id") == team_id), None)
-    if not team:
-        if DEBUG_PROJ: print(f"[proj] team {team_id} not in mRoster week={week}")
-        return 0.0
-
-    entries = ((team.get("roster") or {}).get("entries")) or []
-    total = 0.0
-    starters = 0
-    for e in entries:
-        slot = e.get("lineupSlotId")
-        if slot in (20, 21, None):  # exclude bench + IR only
-            continue
-        starters += 1
-        ppe = e.get("playerPoolEntry") or {}
-        p = ppe.get("player") or {}
-        stats = p.get("stats", []) or []
-        proj = 0.0
-        for s in stats:
-            # statSourceId==1 (projection), statSplitTypeId==1 (total), for that week
-            if (s.get("scoringPeriodId") == week and s.get("statSourceId") == 1 and s.get("statSplitTypeId") == 1):
-                proj = float(s.get("appliedTotal") or 0.0)
-                break
-        total += proj
-    if DEBUG_PROJ:
-        print(f"[proj] mRoster team={team_id} week={week}: starters={starters} total_proj={total:.2f}")
-    return total
-
-def collect_entries_points(side):
-    """Returns (num_starters, actual_points, all_points_list) for best/worst manager calc."""
-    entries = (((side.get("rosterForCurrentScoringPeriod") or {}).get("entries")) or [])
-    pts_all = []
-    starters_pts = []
-    starters_count = 0
-    for e in entries:
-        slot = e.get("lineupSlotId")
-        if slot in (20, 21, None):  # exclude bench + IR only
-            continue
-        starters_count += 1
-        ppe = e.get("playerPoolEntry") or {}
-        pts = ppe.get("appliedStatTotal")
-        if pts is None:
-            stats = ppe.get("player", {}).get("stats", [])
-            pts = 0.0
-            for s in stats or []:
-                if s.get("appliedTotal") is not None:
-                    pts = max(pts, float(s["appliedTotal"]))
-        pts = float(pts or 0.0)
-        pts_all.append(pts)
-        starters_pts.append(pts)
-    return starters_count, sum(starters_pts), pts_all
-
-def build_awards_embed():
+def name_map(doc=None):
+    teams = parse_teams(doc or get("mTeam"))
+    return teams, team_namer(teams)
+
+@traced("job", job="awards")
+def build_awards_embed(doc=None):
+    # NumPy, SQLite and the store modules load only when the job actually runs
+    from history import HistoryArchive
+    from lineup import starter_slot_counts
+    from player_store import PlayerStore
+    from season_store import SeasonStore, sync
+    # Settings + teams in one round trip (or the caller's shared document); the week itself comes from the season store
+    doc = doc or get_views(["mSettings", "mTeam"])
+    current = current_week(doc)
     # Recap prior week
-    week = max(1, current_week() - 1)
-    mm = get("mMatchup")
-    schedule = [s for s in mm.get("schedule", []) if s.get("matchupPeriodId") == week]
-    id_to_team, name_for = name_map()
-
-    team_week = {}
-    match_results = []
-
-    def ensure_team(tid):
-        if tid not in team_week:
-            team_week[tid] = {"tid": tid, "score": 0.0, "proj": 0.0}
-
-    for s in schedule:
-        h_id = s["home"]["teamId"]; a_id = s["away"]["teamId"]
-        ensure_team(h_id); ensure_team(a_id)
-
-        h_side, a_side = s["home"], s["away"]
-        h_pts = safe_score(h_side); a_pts = safe_score(a_side)
-        h_proj = safe_proj(h_side);  a_proj = safe_proj(a_side)
-
-        # Fallback to roster-based projections when zeros
-        if h_proj == 0:
-            h_proj = projected_points_for_team(h_id, week)
-        if a_proj == 0:
-            a_proj = projected_points_for_team(a_id, week)
-
-        team_week[h_id]["score"] = h_pts
-        team_week[a_id]["score"] = a_pts
-        team_week[h_id]["proj"]  = h_proj
-        team_week[a_id]["proj"]  = a_proj
-
-        if h_pts != a_pts:
-            if h_pts > a_pts:
-                match_results.append((h_id, a_id, h_pts - a_pts))
-            else:
-                match_results.append((a_id, h_id, a_pts - h_pts))
-
-        if COMPUTE_OPTIMAL:
-            try:
-                h_starters, h_actual, h_all = collect_entries_points(h_side)
-                a_starters, a_actual, a_all = collect_entries_points(a_side)
-
-                def optimal_sum(all_pts, starters):
-                    if starters <= 0:
-                        return sum(sorted(all_pts, reverse=True)[:max(1, len(all_pts))])
-                    return sum(sorted(all_pts, reverse=True)[:starters])
-
-                if h_all:
-                    h_opt = optimal_sum(h_all, h_starters)
-                    team_week[h_id]["actual_lineup"] = h_actual
-                    team_week[h_id]["optimal_lineup"] = h_opt
-                if a_all:
-                    a_opt = optimal_sum(a_all, a_starters)
-                    team_week[a_id]["actual_lineup"] = a_actual
-                    team_week[a_id]["optimal_lineup"] = a_opt
-            except Exception:
-                pass
+    week = max(1, current - 1)
+    with span("parse", what="teams"):
+        teams, name_for = name_map(doc)
+
+    # Every completed week (for the season-long player awards), fetched only once per store
+    players = PlayerStore() if SEASON_AWARDS else None
+    with SeasonStore() as store:
+        synced = sync(store, current, starter_slot_counts(doc), weeks=sorted(set(range(1, current)) | {week}),
+                      players=players)
+        rows = [r for r in synced[week] if r["opponent_id"] is not None]
+        history = HistoryArchive.load(doc, store)
+        gaps = store.lineup_gaps() if SEASON_AWARDS else {}
+
+    team_week = {r["team_id"]: {"tid": r["team_id"], "score": r["score"], "proj": r["proj"]} for r in rows}
+    match_results = [(r["team_id"], r["opponent_id"], r["score"] - r["opp_score"])
+                     for r in rows if r["result"] == "W"]
+    if COMPUTE_OPTIMAL:
+        for r in rows:
+            if r["optimal_lineup"] is not None:
+                team_week[r["team_id"]]["actual_lineup"] = r["actual_lineup"]
+                team_week[r["team_id"]]["optimal_lineup"] = r["optimal_lineup"]
 
     if not team_week or (max(t["score"] for t in team_week.values()) == 0.0 and
                          min(t["score"] for t in team_week.values()) == 0.0):
@@ -233,51 +106,76 @@ def build_awards_embed():
     best_mgr = max(mgr_list, key=lambda x: x[1]) if mgr_list else None
     worst_mgr= min(mgr_list, key=lambda x: x[1]) if mgr_list else None
 
-    embed = {
-      "title": f"Trophies of the Week — Week {week}",
-      "description": "Justice League Fantasy Football",
-      "color": 0x0B1F35,
-      "fields": [],
-      "footer": {"text": f"Generated {datetime.datetime.now(pytz.timezone(TZ)).strftime('%Y-%m-%d %H:%M %Z')}"}
-    }
-
-    embed["fields"].append({"name":"👑 High score 👑", "value": f"{name_for(high['tid'])} with {high['score']:.2f} points", "inline": False})
-    embed["fields"].append({"name":"💩 Low score 💩",  "value": f"{name_for(low['tid'])} with {low['score']:.2f} points",  "inline": False})
-
-    if blow:
-        embed["fields"].append({"name":"😱 Blow out 😱", "value": f"{name_for(blow[0])} blew out {name_for(blow[1])} by {blow[2]:.2f} points", "inline": False})
-    if close:
-        embed["fields"].append({"name":"😅 Close win 😅", "value": f"{name_for(close[0])} barely beat {name_for(close[1])} by {close[2]:.2f} points", "inline": False})
-
-    if lucky:
-        lw = allplay_wins[lucky[0]]
-        embed["fields"].append({"name":"🍀 Lucky 🍀", "value": f"{name_for(lucky[0])} was {lw}-{(n-1-lw)} in all-play but still got the W", "inline": False})
-    if unlucky:
-        uw = allplay_wins[unlucky[0]]
-        embed["fields"].append({"name":"😡 Unlucky 😡", "value": f"{name_for(unlucky[0])} was {uw}-{(n-1-uw)} in all-play but still took the L", "inline": False})
-
-    if over:
-        embed["fields"].append({
-            "name":"📈 Overachiever 📈",
-            "value": f"{name_for(over[0])} scored {over[2]:.2f} vs {over[3]:.2f} projected (+{over[1]:.2f})",
-            "inline": False
-        })
-    if under:
-        embed["fields"].append({
-            "name":"📉 Underachiever 📉",
-            "value": f"{name_for(under[0])} scored {under[2]:.2f} vs {under[3]:.2f} projected ({under[1]:.2f})",
-            "inline": False
-        })
+    with span("render", job="awards"):
+        embed = {
+          "title": f"Trophies of the Week — Week {week}",
+          "description": "Justice League Fantasy Football",
+          "color": 0x0B1F35,
+          "fields": [],
+          "footer": {"text": f"Generated {datetime.datetime.now(ZoneInfo(env('TIMEZONE', TZ))).strftime('%Y-%m-%d %H:%M %Z')}"}
+        }
 
-    if best_mgr:
-        pct = min(100.0, best_mgr[1])
-        embed["fields"].append({"name":"🤖 Best Manager 🤖", "value": f"{name_for(best_mgr[0])} scored {pct:.2f}% of optimal", "inline": False})
-    if worst_mgr:
-        embed["fields"].append({"name":"🤡 Worst Manager 🤡", "value": f"{name_for(worst_mgr[0])} left {worst_mgr[2]:.2f} points on the bench", "inline": False})
+        embed["fields"].append({"name":"👑 High score 👑", "value": f"{name_for(high['tid'])} with {high['score']:.2f} points", "inline": False})
+        rank = history.score_rank(high["score"]) if history else None
+        if rank and rank <= RECORD_BOOK_TOP:
+            embed["fields"].append({"name":"🏛️ Record Book 🏛️", "value": f"{name_for(high['tid'])}'s {high['score']:.2f} is the #{rank} score in league history (since {min(history.seasons)})", "inline": False})
+        embed["fields"].append({"name":"💩 Low score 💩",  "value": f"{name_for(low['tid'])} with {low['score']:.2f} points",  "inline": False})
+
+        if blow:
+            embed["fields"].append({"name":"😱 Blow out 😱", "value": f"{name_for(blow[0])} blew out {name_for(blow[1])} by {blow[2]:.2f} points", "inline": False})
+        if close:
+            embed["fields"].append({"name":"😅 Close win 😅", "value": f"{name_for(close[0])} barely beat {name_for(close[1])} by {close[2]:.2f} points", "inline": False})
+
+        if lucky:
+            lw = allplay_wins[lucky[0]]
+            embed["fields"].append({"name":"🍀 Lucky 🍀", "value": f"{name_for(lucky[0])} was {lw}-{(n-1-lw)} in all-play but still got the W", "inline": False})
+        if unlucky:
+            uw = allplay_wins[unlucky[0]]
+            embed["fields"].append({"name":"😡 Unlucky 😡", "value": f"{name_for(unlucky[0])} was {uw}-{(n-1-uw)} in all-play but still took the L", "inline": False})
+
+        if over:
+            embed["fields"].append({
+                "name":"📈 Overachiever 📈",
+                "value": f"{name_for(over[0])} scored {over[2]:.2f} vs {over[3]:.2f} projected (+{over[1]:.2f})",
+                "inline": False
+            })
+        if under:
+            embed["fields"].append({
+                "name":"📉 Underachiever 📉",
+                "value": f"{name_for(under[0])} scored {under[2]:.2f} vs {under[3]:.2f} projected ({under[1]:.2f})",
+                "inline": False
+            })
+
+        if best_mgr:
+            pct = min(100.0, best_mgr[1])
+            embed["fields"].append({"name":"🤖 Best Manager 🤖", "value": f"{name_for(best_mgr[0])} scored {pct:.2f}% of optimal", "inline": False})
+        if worst_mgr:
+            embed["fields"].append({"name":"🤡 Worst Manager 🤡", "value": f"{name_for(worst_mgr[0])} left {worst_mgr[2]:.2f} points on the bench", "inline": False})
+
+        if SEASON_AWARDS:
+            embed["fields"].extend(season_fields(players, gaps, name_for))
 
     return embed
 
+def season_fields(players, gaps, name_for):
+    """Season-to-date awards: `gaps` from SeasonStore.lineup_gaps(), the rest from the PlayerStore."""
+    fields = []
+    if gaps:
+        tid, pts = max(gaps.items(), key=lambda kv: kv[1])
+        fields.append({"name":"🪑 Bench Warmer (season) 🪑", "value": f"{name_for(tid)} has left {pts:.2f} points on the bench this season", "inline": False})
+    if not len(players):
+        return fields
+    pickups = players.best_pickups(1)
+    if pickups:
+        tid, pid, pts, starts = pickups[0]
+        fields.append({"name":"💎 Best Pickup (season) 💎", "value": f"{name_for(tid)} added {players.name(pid)}: {pts:.2f} points in {starts} start{'s' if starts != 1 else ''}", "inline": False})
+    blunders = players.worst_start_sit(1)
+    if blunders:
+        wk, tid, benched, bpts, started, spts = blunders[0]
+        fields.append({"name":"🤦 Worst Start/Sit (season) 🤦", "value": f"Week {wk}: {name_for(tid)} benched {players.name(benched)} ({bpts:.2f}) for {players.name(started)} ({spts:.2f})", "inline": False})
+    return fields
+
 if __name__ == "__main__":
     embed = build_awards_embed()
-    send(embed)
+    post([embed])
     print("Posted to Discord:", embed.get("title"))
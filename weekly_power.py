@@ -1,44 +1,62 @@
-import os, requests, datetime, pytz
-from espn_http import get
-from team_utils import team_display
-
-WEBHOOK_URL = os.environ["WEBHOOK_URL"]
-TZ = os.environ.get("TIMEZONE", "America/Denver")
-
-def send(embed):
-    requests.post(WEBHOOK_URL, json={"username":"Justice League Bot","embeds":[embed]}, timeout=20).raise_for_status()
-
-def build_power():
-    data = get("mTeam")  # Teams + records
-    teams = data["teams"]
-
-    # Some shapes use record.overall.pointsFor; keep a safe getter:
-    def points_for(t):
-        try:
-            return float(t["record"]["overall"]["pointsFor"])
-        except Exception:
-            return float(t.get("points", t.get("pointsFor", 0.0)) or 0.0)
-
-    def rec_tuple(t):
-        r = t.get("record", {}).get("overall", {})
-        return int(r.get("wins", 0)), int(r.get("losses", 0)), int(r.get("ties", 0))
-
-    teams_sorted = sorted(teams, key=lambda tt: -points_for(tt))
-
-    lines = []
-    for i, t in enumerate(teams_sorted, start=1):
-        name = team_display(t)
-        w, l, ti = rec_tuple(t)
-        pf = points_for(t)
-        lines.append(f"**{i}. {name}** — PF: {pf:.1f} (Record {w}-{l}-{ti})")
-
-    embed = {
-      "title": "Power Rankings",
-      "description": "\n".join(lines) if lines else "_No data yet_",
-      "color": 0xFFD166,
-      "footer": {"text": f"ESPN League {data.get('id','?')} • {datetime.datetime.now(pytz.timezone(TZ)).strftime('%Y-%m-%d %H:%M %Z')}"}
-    }
+import datetime
+from zoneinfo import ZoneInfo
+from espn_http import env, get_views
+from models import parse_teams, team_namer
+from telemetry import span, traced
+from webhook import post
+
+TZ = "America/Denver"  # default; a league's TIMEZONE setting overrides it
+# Defaults for the POWER_WEIGHTS / POWER_FORM_WEEKS league settings. Weights are a composite
+# like "allplay=0.5,pf=0.3,form=0.2"; metric names are listed in power_engine.METRICS.
+POWER_WEIGHTS = "pf=1"
+FORM_WEEKS = 3
+
+@traced("job", job="power")
+def build_power(doc=None):
+    # NumPy, SQLite and the store modules load only when the job actually runs
+    from lineup import starter_slot_counts
+    from playoff_odds import league_odds, odds_field
+    from power_engine import parse_weights, ranking_order, score_matrix, season_metrics
+    from season_store import SeasonStore, sync, upcoming_schedule
+    data = doc or get_views(["mSettings", "mTeam"])  # Teams + records
+    if "schedule" not in data:  # only the remaining periods are needed, for playoff odds
+        data = {**data, "schedule": upcoming_schedule(data)}
+    with span("parse", what="teams"):
+        teams = parse_teams(data)
+
+    # Weekly rows for the metrics come from the store; only newly completed weeks are fetched.
+    # W-L-T and PF stay ESPN's own record, which already includes stat corrections.
+    with SeasonStore() as store:
+        synced = sync(store, data["status"]["currentMatchupPeriod"], starter_slot_counts(data))
+        rows = store.rows()
+        odds = league_odds(data, synced)
+
+    teams_sorted = sorted(teams.values(), key=lambda tt: -tt.points_for)
+    extras = {}
+    if rows:
+        with span("metrics", rows=len(rows)):
+            team_ids, _, scores, results = score_matrix(rows)
+            m = season_metrics(scores, results, int(env("POWER_FORM_WEEKS", FORM_WEEKS)))
+            ranked = [team_ids[i] for i in ranking_order(m, parse_weights(env("POWER_WEIGHTS", POWER_WEIGHTS)))[:, -1]]
+        teams_sorted = [teams[tid] for tid in ranked if tid in teams] + \
+                       [t for t in teams_sorted if t.id not in ranked]
+        for i, tid in enumerate(team_ids):
+            ap_w, ap_l = int(m["allplay_w"][i, -1]), int(m["allplay_l"][i, -1])
+            extras[tid] = f" • All-play {ap_w}-{ap_l} • Luck {m['luck'][i, -1]:+.1f}"
+
+    with span("render", job="power"):
+        lines = []
+        for i, t in enumerate(teams_sorted, start=1):
+            lines.append(f"**{i}. {t.name}** — PF: {t.points_for:.1f} (Record {t.wins}-{t.losses}-{t.ties}){extras.get(t.id, '')}")
+
+        embed = {
+          "title": "Power Rankings",
+          "description": "\n".join(lines) if lines else "_No data yet_",
+          "color": 0xFFD166,
+          "fields": [odds_field(odds, team_namer(teams))] if odds else [],
+          "footer": {"text": f"ESPN League {data.get('id','?')} • {datetime.datetime.now(ZoneInfo(env('TIMEZONE', TZ))).strftime('%Y-%m-%d %H:%M %Z')}"}
+        }
     return embed
 
 if __name__ == "__main__":
-    send(build_power())
+    post([build_power()])
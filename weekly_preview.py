@@ -1,50 +1,66 @@
-import os, requests, datetime, pytz
-from espn_http import get
-from team_utils import team_display
+import datetime
+from zoneinfo import ZoneInfo
+from espn_http import env, get, get_views
+from models import parse_teams, parse_schedule, team_namer
+from telemetry import span, traced
 
-WEBHOOK_URL = os.environ["WEBHOOK_URL"]
-TZ = os.environ.get("TIMEZONE", "America/Denver")
+TZ = "America/Denver"  # default; a league's TIMEZONE setting overrides it
 
-def send(embed):
-    requests.post(WEBHOOK_URL, json={"username":"Justice League Bot","embeds":[embed]}, timeout=20).raise_for_status()
-
-def current_week():
-    data = get("mSettings")
+def current_week(doc=None):
+    data = doc or get("mSettings")
     return data["status"]["currentMatchupPeriod"]
 
-def build_preview():
-    week = current_week()
-    # Pull schedule from mMatchup
-    mm = get("mMatchup")
-    schedule = [s for s in mm.get("schedule", []) if s.get("matchupPeriodId") == week]
-
-    # Build a robust team name map from mTeam (more reliable for names)
-    mt = get("mTeam")
-    team_map = {t["id"]: t for t in mt["teams"]}
-
-    def name_for(tid):
-        t = team_map.get(tid, {})
-        # Try common fields in order
-        for a,b in [("location","nickname"), ("teamLocation","teamNickname")]:
-            loc, nick = t.get(a), t.get(b)
-            if loc or nick:
-                return f"{(loc or '').strip()} {(nick or '').strip()}".strip()
-        return t.get("name") or t.get("abbrev") or f"Team {tid}"
+@traced("job", job="preview")
+def build_preview(doc=None):
+    # NumPy, SQLite and the store modules load only when the job actually runs
+    from history import HistoryArchive
+    from lineup import starter_slot_counts
+    from playoff_odds import league_odds, odds_field
+    from season_store import SeasonStore, sync, upcoming_schedule
+    # Settings and teams (more reliable for names), then only this week onward of the schedule
+    doc = doc or get_views(["mSettings", "mTeam"])
+    if "schedule" not in doc:
+        doc = {**doc, "schedule": upcoming_schedule(doc)}
+    week = current_week(doc)
+    with span("parse", what="schedule"):
+        schedule = parse_schedule(doc, week)
+        name_for = team_namer(parse_teams(doc))
 
-    embed = {
-      "title": f"Week {week} Matchup Preview",
-      "description": "Justice League Fantasy Football",
-      "color": 0x1F8B4C,
-      "fields": [],
-      "footer": {"text": f"Generated {datetime.datetime.now(pytz.timezone(TZ)).strftime('%Y-%m-%d %H:%M %Z')}"}
-    }
+    with span("render", job="preview"):
+        embed = {
+          "title": f"Week {week} Matchup Preview",
+          "description": "Justice League Fantasy Football",
+          "color": 0x1F8B4C,
+          "fields": [],
+          "footer": {"text": f"Generated {datetime.datetime.now(ZoneInfo(env('TIMEZONE', TZ))).strftime('%Y-%m-%d %H:%M %Z')}"}
+        }
 
-    for s in schedule:
-        home_name = name_for(s["home"]["teamId"])
-        away_name = name_for(s["away"]["teamId"])
-        embed["fields"].append({"name":"\u200b","value":f"**{home_name}** vs **{away_name}**", "inline": False})
+        pairs = []
+        for m in schedule:
+            if m.away is None:
+                continue
+            pairs.append((m.home.team_id, m.away.team_id))
+            home_name = name_for(m.home.team_id)
+            away_name = name_for(m.away.team_id)
+            embed["fields"].append({"name":"\u200b","value":f"**{home_name}** vs **{away_name}**", "inline": False})
 
     if not embed["fields"]:
         embed["description"] = "_No scheduled matchups found for this week yet_"
+    else:
+        with SeasonStore() as store:
+            odds = league_odds(doc, sync(store, week, starter_slot_counts(doc)))
+            history = HistoryArchive.load(doc, store)
+        # All-time series under each matchup (archived seasons plus this season's stored weeks),
+        # then each franchise's record before this season (see history.py)
+        if history:
+            for field, (a, b) in zip(embed["fields"], pairs):
+                line = history.rivalry_line(a, b, name_for)
+                if line:
+                    field["value"] += f"\n{line}"
+            lines = [l for a, b in pairs for l in (history.franchise_line(a, name_for), history.franchise_line(b, name_for)) if l]
+            if lines:
+                embed["fields"].append({"name": "🏛️ Franchise History 🏛️", "value": "\n".join(lines)[:1024], "inline": False})
+        if odds:
+            embed["fields"].append(odds_field(odds, name_for))
 
     return embed
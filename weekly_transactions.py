@@ -0,0 +1,56 @@
+import datetime
+from zoneinfo import ZoneInfo
+from espn_http import env, get_views
+from models import parse_teams, team_namer
+from telemetry import span, traced
+from transaction_feed import TransactionFeed
+from webhook import post
+
+TZ = "America/Denver"  # default; a league's TIMEZONE setting overrides it
+
+def _line(agg: dict) -> str:
+    parts = [f"+{agg['adds']} / −{agg['drops']}"] if agg["adds"] or agg["drops"] else []
+    if agg["trades"]:
+        parts.append(f"{agg['trades']} trade{'s' if agg['trades'] != 1 else ''}")
+    if agg["faab"]:
+        parts.append(f"${agg['faab']} FAAB")
+    return " • ".join(parts)
+
+@traced("job", job="transactions")
+def build_transactions(doc=None):
+    doc = doc or get_views(["mSettings", "mTeam"])
+    status = doc["status"]
+    current = status.get("latestScoringPeriod") or doc.get("scoringPeriodId") or status["currentMatchupPeriod"]
+    # Recap the period that just finished, like the awards
+    week = max(1, current - 1)
+    with span("parse", what="teams"):
+        name_for = team_namer(parse_teams(doc))
+
+    feed = TransactionFeed()
+    feed.update(current)
+
+    with span("render", job="transactions"):
+        moves = sorted(feed.period(week).items(), key=lambda kv: -(kv[1]["adds"] + kv[1]["drops"] + kv[1]["trades"]))
+        lines = [f"**{name_for(int(tid))}** — {_line(agg)}" for tid, agg in moves]
+        embed = {
+          "title": f"Transactions — Week {week}",
+          "description": "\n".join(lines) if lines else "_No moves this week_",
+          "color": 0x457B9D,
+          "fields": [],
+          "footer": {"text": f"Generated {datetime.datetime.now(ZoneInfo(env('TIMEZONE', TZ))).strftime('%Y-%m-%d %H:%M %Z')}"}
+        }
+        season = feed.season
+        if season:
+            busiest = max(season, key=lambda t: season[t]["adds"] + season[t]["drops"])
+            spender = max(season, key=lambda t: season[t]["faab"])
+            trader = max(season, key=lambda t: season[t]["trades"])
+            value = [f"Most active: {name_for(int(busiest))} ({season[busiest]['adds']} adds, {season[busiest]['drops']} drops)"]
+            if season[spender]["faab"]:
+                value.append(f"Biggest FAAB spender: {name_for(int(spender))} (${season[spender]['faab']})")
+            if season[trader]["trades"]:
+                value.append(f"Most trades: {name_for(int(trader))} ({season[trader]['trades']})")
+            embed["fields"].append({"name": "📋 Season to date 📋", "value": "\n".join(value), "inline": False})
+    return embed
+
+if __name__ == "__main__":
+    post([build_transactions()])